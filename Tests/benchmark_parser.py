@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Profile parsing benchmark
+Times the profile extractor on the saved LinkedIn HTML fixtures (no browser or network needed)
+for every installed parser backend (html.parser, lxml, selectolax)
+
+Usage: python Tests/benchmark_parser.py [--runs 20] [--backend lxml]
+"""
+
+import argparse
+import contextlib
+import glob
+import io
+import os
+import statistics
+import sys
+import time
+
+# Make synapse-agent/src importable when run from the repository root
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "profiles")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "synapse-agent", "src"))
+
+from extractor import extract_profile, parse_document, LXML_AVAILABLE, SELECTOLAX_AVAILABLE
+
+def available_backends():
+    backends = ["html.parser"]
+    if LXML_AVAILABLE:
+        backends.append("lxml")
+    if SELECTOLAX_AVAILABLE:
+        backends.append("selectolax")
+    return backends
+
+def percentile(values, pct):
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+def time_call(fn, runs):
+    """Runs fn `runs` times with stdout silenced; returns the timings in milliseconds."""
+    timings = []
+    for _ in range(runs):
+        with contextlib.redirect_stdout(io.StringIO()):
+            started = time.perf_counter()
+            fn()
+            timings.append((time.perf_counter() - started) * 1000)
+    return timings
+
+def benchmark_fixture(path, backend, runs):
+    with open(path, encoding="utf-8") as f:
+        content = f.read()
+
+    tree = parse_document(content, backend)
+    parse_times = time_call(lambda: parse_document(content, backend), runs)
+    extract_times = time_call(lambda: extract_profile(content, tree=tree), runs)
+    total_times = time_call(lambda: extract_profile(content, backend=backend), runs)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        profile = extract_profile(content, backend=backend)
+
+    return {
+        "fixture": os.path.basename(path),
+        "backend": backend,
+        "size_kb": len(content.encode("utf-8")) / 1024,
+        "parse_ms": statistics.mean(parse_times),
+        "extract_ms": statistics.mean(extract_times),
+        "total_mean_ms": statistics.mean(total_times),
+        "total_median_ms": statistics.median(total_times),
+        "total_p95_ms": percentile(total_times, 95),
+        "experience": len(profile["experience"]),
+        "education": len(profile["education"])
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark profile extraction on saved HTML fixtures")
+    parser.add_argument("--runs", type=int, default=20, help="Timed runs per fixture")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Directory with saved profile pages (*.html)")
+    parser.add_argument("--backend", choices=["html.parser", "lxml", "selectolax"],
+                        help="Only benchmark this parser backend (default: every installed backend)")
+    args = parser.parse_args()
+
+    paths = sorted(glob.glob(os.path.join(args.fixtures, "*.html")))
+    if not paths:
+        print(f"❌ No HTML fixtures found in {args.fixtures}")
+        return False
+
+    backends = [args.backend] if args.backend else available_backends()
+    print(f"⏱️  Profile parsing benchmark ({args.runs} runs per fixture, backends: {', '.join(backends)})")
+    summary = []
+    for backend in backends:
+        print(f"\n🔧 Backend: {backend}")
+        print(f"{'fixture':<24}{'size KB':>9}{'parse':>9}{'extract':>9}{'mean':>9}{'median':>9}{'p95':>9}{'exp/edu':>9}")
+        results = []
+        for path in paths:
+            r = benchmark_fixture(path, backend, args.runs)
+            results.append(r)
+            print(f"{r['fixture']:<24}{r['size_kb']:>9.1f}{r['parse_ms']:>9.2f}{r['extract_ms']:>9.2f}"
+                  f"{r['total_mean_ms']:>9.2f}{r['total_median_ms']:>9.2f}{r['total_p95_ms']:>9.2f}"
+                  f"{r['experience']:>5}/{r['education']}")
+        total_kb = sum(r["size_kb"] for r in results)
+        total_ms = sum(r["total_mean_ms"] for r in results)
+        summary.append((backend, total_ms / len(results), total_kb / (total_ms / 1000) / 1024))
+
+    print(f"\n📊 {len(paths)} profiles per backend (times in ms; parse = tree build, extract = indexing + field extraction)")
+    baseline = summary[0][1]
+    for backend, per_profile_ms, mb_per_s in summary:
+        print(f"   {backend:<12} {per_profile_ms:8.2f} ms per profile  {mb_per_s:6.1f} MB/s  {baseline / per_profile_ms:5.1f}x vs {summary[0][0]}")
+    return True
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
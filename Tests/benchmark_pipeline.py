@@ -0,0 +1,277 @@
+#!/usr/bin/env python3
+"""
+Offline sourcing pipeline benchmark
+Runs SourcingAgent.run end to end without Google, LinkedIn or Gemini: the saved profile
+fixtures are served to the shared Chromium by a local HTTP stand-in and scraped through
+LinkedInParser.scrape_profile, Custom Search returns the local profile URLs, and
+genai.Client is replaced by a fake that answers after a configurable latency.
+Reports per-stage timings (the pipeline's metrics spans), throughput and memory for each job size.
+
+Needs Playwright with Chromium installed (playwright install chromium) and the packages
+in requirements.txt; no API keys or network access are used.
+
+Usage: python Tests/benchmark_pipeline.py [--sizes 10,50,500] [--llm-latency 0.8] [--concurrency 3] [--batch-scoring]
+"""
+
+import argparse
+import asyncio
+import glob
+import logging
+import json
+import os
+import random
+import re
+import resource
+import statistics
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+
+# Make synapse-agent/src importable when run from the repository root
+FIXTURES_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures", "profiles")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "synapse-agent", "src"))
+
+JOB_DESCRIPTION = """Senior ML Engineer - LLM Training (Mountain View, CA)
+Train and scale large language models, build distributed training infrastructure
+and work with research on evaluation. 5+ years of Python, PyTorch and GPU experience."""
+
+# Offline configuration; must be in place before the agent modules are imported
+os.environ.setdefault("GEMINI_API_KEY", "offline-benchmark")
+os.environ.setdefault("LINKEDIN_SESSION_COOKIE", "offline-benchmark")
+os.environ["CANDIDATE_CACHE_ENABLED"] = "false"
+os.environ["SEARCH_CACHE_TTL_SECONDS"] = "0"
+os.environ["SCRAPE_MIN_INTERVAL_SECONDS"] = "0"
+os.environ.setdefault("DEBUG_SCREENSHOTS", "off")
+
+# The agent creates sourcing_cache.db and friends in the working directory
+START_DIR = os.getcwd()
+WORK_DIR = tempfile.mkdtemp(prefix="synapse-bench-")
+os.chdir(WORK_DIR)
+
+import agent as agent_module
+import browser as browser_module
+import llm as llm_module
+import metrics
+import tools
+
+# Fixtures link LinkedIn's CDN stylesheets; keep the benchmark hermetic
+browser_module.BLOCKED_DOMAINS += ",licdn.com"
+
+class FixtureServer:
+    """
+    Local stand-in for linkedin.com: every /in/<slug> path is answered with one of the
+    saved profile pages (chosen by slug, so a URL always gets the same page).
+    """
+    def __init__(self, fixtures: list):
+        self.fixtures = fixtures
+        self.requests = 0
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                server.requests += 1
+                match = re.match(r"^/in/([^/?#]+)", self.path)
+                if not match:
+                    self.send_error(404)
+                    return
+                body = server.fixtures[sum(map(ord, match.group(1))) % len(server.fixtures)]
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+
+            def log_message(self, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.httpd.daemon_threads = True
+        self.base_url = f"http://127.0.0.1:{self.httpd.server_address[1]}"
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="fixture-server", daemon=True)
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+    def profile_urls(self, prefix: str, count: int) -> list:
+        return [f"{self.base_url}/in/{prefix}-candidate-{i}" for i in range(count)]
+
+def fake_analysis(name: str, url: str) -> dict:
+    return {
+        "name": name,
+        "linkedin_url": url,
+        "fit_score": round(random.uniform(4.0, 9.5), 1),
+        "score_breakdown": {key: round(random.uniform(4.0, 10.0), 1)
+                            for key in ("education", "trajectory", "company", "skills", "location", "tenure")},
+        "reasoning": "Offline benchmark analysis.",
+        "confidence_score": 0.8,
+        "outreach_message": f"Hi {name}, your background looks like a great fit for our ML team."
+    }
+
+def fake_response_text(prompt: str) -> str:
+    """Answers the agent's single-candidate and batch scoring prompts with valid JSON."""
+    if "one block per candidate" in prompt:
+        results = []
+        for match in re.finditer(r"^\[(\d+)\]\n((?:.+\n?)+)", prompt, re.MULTILINE):
+            fields = dict(line.split(": ", 1) for line in match.group(2).splitlines() if ": " in line)
+            item = fake_analysis(fields.get("name", "N/A"), fields.get("url", "N/A"))
+            item["candidate_id"] = int(match.group(1))
+            results.append(item)
+        return json.dumps(results)
+    if "Candidate's Profile URL" in prompt:
+        url = re.search(r"\*\*Candidate's Profile URL:\*\*\s*(\S+)", prompt).group(1)
+        name = re.search(r"^name: (.*)$", prompt, re.MULTILINE)
+        return json.dumps(fake_analysis(name.group(1) if name else "N/A", url))
+    return "site:linkedin.com/in/ \"ML Engineer\" \"LLM\""
+
+class FakeGenaiClient:
+    """Drop-in for google.genai.Client: models.generate_content and aio.models.generate_content."""
+    latency = 0.8
+    jitter = 0.2
+
+    def __init__(self, *args, **kwargs):
+        self.models = SimpleNamespace(generate_content=self._generate)
+        self.aio = SimpleNamespace(models=SimpleNamespace(generate_content=self._agenerate))
+
+    def _delay(self):
+        return max(0.0, random.gauss(self.latency, self.latency * self.jitter))
+
+    def _generate(self, model, contents, config=None):
+        time.sleep(self._delay())
+        return self._response(contents)
+
+    async def _agenerate(self, model, contents, config=None):
+        await asyncio.sleep(self._delay())
+        return self._response(contents)
+
+    @staticmethod
+    def _response(contents):
+        # Rough prompt token count, so the agent's prompt token report has "reported" numbers
+        usage = SimpleNamespace(prompt_token_count=len(contents) // 4)
+        return SimpleNamespace(text=fake_response_text(contents), usage_metadata=usage)
+
+async def run_job(sourcing_agent, server, size: int, args, run_index: int) -> dict:
+    urls = server.profile_urls(f"s{size}-r{run_index}", size)
+
+    @metrics.timed("search")
+    async def fake_search(query, num_results=10):
+        await asyncio.sleep(args.search_latency)
+        return urls[:num_results], True
+    tools.search_linkedin_pages = fake_search
+
+    started = time.perf_counter()
+    cpu_started = time.process_time()
+    response = await sourcing_agent.run(
+        JOB_DESCRIPTION, search_query=None, num_results=size,
+        concurrency=args.concurrency, batch_scoring=args.batch_scoring
+    )
+    wall = time.perf_counter() - started
+    results = response.get("results", [])
+    return {
+        "wall": wall,
+        "cpu": time.process_time() - cpu_started,
+        "scored": sum(1 for r in results if isinstance(r, dict) and "fit_score" in r),
+        "failed": sum(1 for r in results if not (isinstance(r, dict) and "fit_score" in r)),
+        "error": response.get("error") or response.get("message")
+    }
+
+def print_report(size: int, jobs: list, timings: dict, traced_peak: int):
+    walls = [job["wall"] for job in jobs]
+    total_candidates = size * len(jobs)
+    print(f"\n📊 {size} candidates x {len(jobs)} run(s)")
+    if any(job["error"] for job in jobs):
+        print(f"   ❌ {jobs[0]['error']}")
+    print(f"   wall {statistics.mean(walls):8.2f} s/job   throughput {total_candidates / sum(walls):7.2f} candidates/s   "
+          f"cpu {statistics.mean(job['cpu'] for job in jobs):6.2f} s/job   "
+          f"scored {sum(job['scored'] for job in jobs)}/{total_candidates}")
+    print(f"   {'stage':<20}{'calls':>7}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'max ms':>10}{'total s':>10}")
+    for stage, t in timings.items():
+        print(f"   {stage:<20}{t['count']:>7}{t['mean_seconds'] * 1000:>10.1f}{t['p50_seconds'] * 1000:>10.1f}"
+              f"{t['p95_seconds'] * 1000:>10.1f}{t['max_seconds'] * 1000:>10.1f}{t['total_seconds']:>10.2f}")
+    # ru_maxrss is in KB on Linux and bytes on macOS
+    maxrss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    children_mb = resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss / (1024 * 1024 if sys.platform == "darwin" else 1024)
+    memory = f"   memory: peak RSS {maxrss_mb:.0f} MB (python process)"
+    if traced_peak:
+        memory += f", traced Python heap peak {traced_peak / (1024 * 1024):.1f} MB"
+    if children_mb:
+        memory += f", largest exited child {children_mb:.0f} MB"
+    print(memory)
+
+async def benchmark(args, fixtures) -> bool:
+    FakeGenaiClient.latency = args.llm_latency
+    FakeGenaiClient.jitter = args.llm_jitter
+    llm_module.genai = SimpleNamespace(Client=FakeGenaiClient)
+
+    sourcing_agent = agent_module.SourcingAgent()
+    await sourcing_agent.browser.start(warm_contexts=args.concurrency)
+
+    passed = True
+    with FixtureServer(fixtures) as server:
+        try:
+            for size in args.sizes:
+                if args.trace_memory:
+                    tracemalloc.start()
+                # The pipeline's own stage spans, collected across all runs of this size
+                with metrics.track_job() as timings:
+                    jobs = [await run_job(sourcing_agent, server, size, args, run_index) for run_index in range(args.runs)]
+                traced_peak = 0
+                if args.trace_memory:
+                    traced_peak = tracemalloc.get_traced_memory()[1]
+                    tracemalloc.stop()
+                print_report(size, jobs, timings.summary(), traced_peak)
+                passed = passed and all(not job["error"] and job["scored"] == size for job in jobs)
+        finally:
+            await sourcing_agent.browser.stop()
+        print(f"\n🌐 Fixture server answered {server.requests} page requests; "
+              f"network totals {json.dumps(sourcing_agent.network_stats)}; LLM {json.dumps(sourcing_agent.llm.snapshot())}; "
+              f"prompts {json.dumps(sourcing_agent.prompt_stats)}")
+    return passed
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the sourcing pipeline offline on saved HTML fixtures")
+    parser.add_argument("--sizes", default="10,50,500", help="Comma-separated candidate counts per job")
+    parser.add_argument("--runs", type=int, default=1, help="Jobs per size")
+    parser.add_argument("--concurrency", type=int, default=3, help="Concurrent browser pages per job")
+    parser.add_argument("--batch-scoring", action="store_true", help="Score candidates in batches")
+    parser.add_argument("--llm-latency", type=float, default=0.8, help="Mean fake Gemini latency in seconds")
+    parser.add_argument("--llm-jitter", type=float, default=0.2, help="Latency standard deviation, as a fraction of the mean")
+    parser.add_argument("--search-latency", type=float, default=0.3, help="Fake Custom Search latency in seconds")
+    parser.add_argument("--fixtures", default=FIXTURES_DIR, help="Directory with saved profile pages (*.html)")
+    parser.add_argument("--trace-memory", action="store_true", help="Track the Python heap peak (slows the run down)")
+    parser.add_argument("--verbose", action="store_true", help="Show the agent's own log output (DEBUG)")
+    args = parser.parse_args()
+    # Agent logging costs time too; keep it at warnings unless asked for
+    logging.getLogger("synapse").setLevel(logging.DEBUG if args.verbose else logging.WARNING)
+    args.sizes = [int(size) for size in args.sizes.split(",") if size.strip()]
+
+    paths = sorted(glob.glob(os.path.join(START_DIR, args.fixtures, "*.html")))
+    if not paths:
+        print(f"❌ No HTML fixtures found in {args.fixtures}")
+        return False
+    fixtures = []
+    for path in paths:
+        with open(path, "rb") as f:
+            fixtures.append(f.read())
+
+    print(f"⏱️  Offline pipeline benchmark: sizes {args.sizes}, {args.concurrency} pages, "
+          f"LLM {args.llm_latency:.2f}s ±{args.llm_jitter:.0%}, {'batch' if args.batch_scoring else 'per-candidate'} scoring, "
+          f"{len(fixtures)} fixtures, workdir {WORK_DIR}")
+    try:
+        passed = asyncio.run(benchmark(args, fixtures))
+    except Exception as e:
+        print(f"❌ Benchmark failed: {e}")
+        return False
+    print(f"\n{'🎉 All candidates scored' if passed else '⚠️ Some candidates were not scored'}")
+    return passed
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Parser backend regression test
+Checks that every installed parser backend (lxml, selectolax) and the in-browser DOM
+extractor (PROFILE_EXTRACTION_MODE=dom) extract exactly the same profile data as the
+default html.parser backend on the saved HTML fixtures
+
+The DOM extractor is checked twice: in Node.js against a minimal DOM built from the
+html.parser tree (no browser needed), and in Chromium when Playwright's browser is
+installed. A check that cannot run is reported as NOT TESTED.
+
+Usage: python Tests/test_parser_backends.py
+"""
+
+import glob
+import json
+import os
+import shutil
+import subprocess
+import sys
+
+# Make synapse-agent/src importable when run from the repository root
+FIXTURES_DIR = os.path.join(os.path.dirname(__file__), "fixtures", "profiles")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "synapse-agent", "src"))
+
+from bs4 import BeautifulSoup, NavigableString, Tag
+from bs4.element import PreformattedString
+from extractor import extract_profile, LXML_AVAILABLE, SELECTOLAX_AVAILABLE, DOM_EXTRACTOR_JS, DOM_EXTRACTOR_CONFIG
+
+try:
+    from playwright.sync_api import sync_playwright
+    PLAYWRIGHT_AVAILABLE = True
+except ImportError:
+    PLAYWRIGHT_AVAILABLE = False
+
+NODE = shutil.which("node")
+
+# Just enough of the DOM for DOM_EXTRACTOR_JS: element/text nodes, getAttribute, and
+# querySelector(All) for the tag.class[attr="value"] selectors (comma lists) it uses.
+# Each page arrives as a tree of [tag, attrs, children] lists and text strings.
+NODE_DOM_SHIM = """
+const SIMPLE_SELECTOR = /^([a-zA-Z][\\w-]*)?((?:\\.[\\w-]+)*)(?:\\[([\\w-]+)(?:="([^"]*)")?\\])?$/;
+
+class Node {
+    constructor(nodeType, tagName, attrs, nodeValue) {
+        this.nodeType = nodeType;
+        this.tagName = tagName;
+        this.attrs = attrs;
+        this.nodeValue = nodeValue;
+        this.childNodes = [];
+    }
+    getAttribute(name) {
+        return Object.prototype.hasOwnProperty.call(this.attrs, name) ? this.attrs[name] : null;
+    }
+    *descendants() {
+        for (const child of this.childNodes) {
+            if (child.nodeType !== 1) continue;
+            yield child;
+            yield* child.descendants();
+        }
+    }
+    querySelectorAll(selectors) {
+        const parsed = selectors.split(',').map((selector) => {
+            const match = SIMPLE_SELECTOR.exec(selector.trim());
+            if (!match) throw new Error('Unsupported selector: ' + selector);
+            return {
+                tag: match[1] && match[1].toUpperCase(),
+                classes: match[2] ? match[2].slice(1).split('.') : [],
+                attr: match[3],
+                value: match[4]
+            };
+        });
+        const matches = (element, s) => {
+            if (s.tag && element.tagName !== s.tag) return false;
+            const tokens = (element.getAttribute('class') || '').split(/\\s+/);
+            if (!s.classes.every((cls) => tokens.includes(cls))) return false;
+            if (s.attr === undefined) return true;
+            const value = element.getAttribute(s.attr);
+            return value !== null && (s.value === undefined || value === s.value);
+        };
+        return Array.from(this.descendants()).filter((element) => parsed.some((s) => matches(element, s)));
+    }
+    querySelector(selectors) {
+        return this.querySelectorAll(selectors)[0] || null;
+    }
+}
+
+const build = (tree) => {
+    if (typeof tree === 'string') return new Node(3, undefined, {}, tree);
+    const [tag, attrs, children] = tree;
+    const element = new Node(tag === '#document' ? 9 : 1, tag.toUpperCase(), attrs, null);
+    element.childNodes = children.map(build);
+    return element;
+};
+
+const {config, pages} = JSON.parse(require('fs').readFileSync(0, 'utf8'));
+const extract = EXTRACTOR;
+const results = {};
+for (const [name, tree] of Object.entries(pages)) {
+    globalThis.document = build(tree);
+    results[name] = extract(config);
+}
+process.stdout.write(JSON.stringify(results));
+"""
+
+def dom_tree(node):
+    """html.parser tree as nested [tag, attrs, children] lists, without comments and doctypes"""
+    children = []
+    for child in node.contents:
+        if isinstance(child, Tag):
+            children.append(dom_tree(child))
+        elif isinstance(child, NavigableString) and not isinstance(child, PreformattedString):
+            children.append(str(child))
+    attrs = {name: " ".join(value) if isinstance(value, list) else value for name, value in node.attrs.items()}
+    return ["#document" if node.name == "[document]" else node.name, attrs, children]
+
+def check_backend(backend, corpus):
+    """Compares one backend against html.parser on every fixture"""
+    print(f"🔍 Testing {backend} backend...")
+    passed = True
+    for name, content in corpus.items():
+        expected = extract_profile(content, backend="html.parser")
+        actual = extract_profile(content, backend=backend)
+        if actual == expected:
+            print(f"   ✅ {name}")
+        else:
+            passed = False
+            print(f"   ❌ {name} differs from html.parser")
+            print(f"      expected: {json.dumps(expected)[:300]}")
+            print(f"      actual:   {json.dumps(actual)[:300]}")
+    return passed
+
+def check_dom_extractor_node(corpus):
+    """Runs the JavaScript extractor in Node.js on each fixture's html.parser tree and compares it to html.parser"""
+    print("🔍 Testing DOM extractor in Node.js...")
+    payload = {
+        "config": DOM_EXTRACTOR_CONFIG,
+        "pages": {name: dom_tree(BeautifulSoup(content, "html.parser")) for name, content in corpus.items()}
+    }
+    script = NODE_DOM_SHIM.replace("EXTRACTOR", DOM_EXTRACTOR_JS.strip())
+    run = subprocess.run([NODE, "-e", script], input=json.dumps(payload), capture_output=True, text=True, encoding="utf-8")
+    if run.returncode != 0:
+        print(f"   ❌ node failed: {run.stderr.strip()[:500]}")
+        return False
+
+    results = json.loads(run.stdout)
+    passed = True
+    for name, content in corpus.items():
+        expected = extract_profile(content, backend="html.parser")
+        actual = results[name]
+        if actual == expected:
+            print(f"   ✅ {name}")
+        else:
+            passed = False
+            print(f"   ❌ {name} differs from html.parser")
+            print(f"      expected: {json.dumps(expected)[:300]}")
+            print(f"      actual:   {json.dumps(actual)[:300]}")
+    return passed
+
+def check_dom_extractor(corpus):
+    """Runs the in-page JavaScript extractor on each fixture and compares it to html.parser"""
+    print("🔍 Testing in-browser DOM extractor...")
+    passed = True
+    with sync_playwright() as p:
+        try:
+            browser = p.chromium.launch(headless=True)
+        except Exception as e:
+            print(f"   ⚠️ NOT TESTED: Chromium could not be launched ({str(e).splitlines()[0]})")
+            return True
+        page = browser.new_page()
+        # Fixtures are static snapshots; don't let them fetch stylesheets or images
+        page.route("**/*", lambda route: route.abort())
+        for name, content in corpus.items():
+            expected = extract_profile(content, backend="html.parser")
+            page.set_content(content, wait_until="domcontentloaded")
+            actual = page.evaluate(DOM_EXTRACTOR_JS, DOM_EXTRACTOR_CONFIG)
+            if actual == expected:
+                print(f"   ✅ {name}")
+            else:
+                passed = False
+                print(f"   ❌ {name} differs from html.parser")
+                print(f"      expected: {json.dumps(expected)[:300]}")
+                print(f"      actual:   {json.dumps(actual)[:300]}")
+        browser.close()
+    return passed
+
+def check_fixtures_extract_profiles(corpus):
+    """Sanity check: the fixtures still produce a name for every non-empty profile"""
+    print("🔍 Testing fixtures with html.parser...")
+    missing = [name for name, content in corpus.items() if extract_profile(content, backend="html.parser")["name"] == "N/A"]
+    if missing:
+        print(f"❌ No name extracted from: {', '.join(missing)}")
+        return False
+    print(f"✅ All {len(corpus)} fixtures extracted")
+    return True
+
+def main():
+    paths = sorted(glob.glob(os.path.join(FIXTURES_DIR, "*.html")))
+    if not paths:
+        print(f"❌ No HTML fixtures found in {FIXTURES_DIR}")
+        return False
+
+    corpus = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            corpus[os.path.basename(path)] = f.read()
+
+    results = [check_fixtures_extract_profiles(corpus)]
+    for backend, available in (("lxml", LXML_AVAILABLE), ("selectolax", SELECTOLAX_AVAILABLE)):
+        if available:
+            results.append(check_backend(backend, corpus))
+        else:
+            print(f"⚠️ {backend} is not installed, skipping")
+    if NODE:
+        results.append(check_dom_extractor_node(corpus))
+    else:
+        print("⚠️ NOT TESTED: node is not installed, skipping the Node.js DOM extractor check")
+    if PLAYWRIGHT_AVAILABLE:
+        results.append(check_dom_extractor(corpus))
+    else:
+        print("⚠️ NOT TESTED: playwright is not installed, skipping the in-browser DOM extractor check")
+
+    passed = all(results)
+    print(f"\n{'🎉 All extractors match' if passed else '❌ Extractors disagree'}")
+    return passed
+
+if __name__ == "__main__":
+    sys.exit(0 if main() else 1)
@@ -1,7 +1,7 @@
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import HTMLResponse
+from fastapi.responses import HTMLResponse, PlainTextResponse, StreamingResponse
 from pydantic import BaseModel, Field
 from dotenv import load_dotenv
 import asyncio
@@ -22,23 +22,37 @@ env_paths = [
     os.path.join(os.path.dirname(__file__), '.env'),  # synapse-agent/.env
     '.env'  # current directory
 ]
+loaded_env_path = None
 for env_path in env_paths:
     if os.path.exists(env_path):
         load_dotenv(env_path)
-        print(f"Loaded environment from: {env_path}")
+        loaded_env_path = env_path
         break
 
-# Verify critical environment variables are loaded
-gemini_key = os.getenv("GEMINI_API_KEY")
-print(f"GEMINI_API_KEY loaded: {'Yes' if gemini_key else 'No'}")
-
 # Fix imports for both direct execution and package imports
 try:
     from .src.agent import SourcingAgent
+    from .src.jobs import JobQueue
+    from .src import database
+    from .src import metrics
+    from .src.logs import get_logger, log_context
 except ImportError:
     # If running directly, adjust the path
     sys.path.append(os.path.join(os.path.dirname(__file__), 'src'))
     from agent import SourcingAgent
+    from jobs import JobQueue
+    import database
+    import metrics
+    from logs import get_logger, log_context
+
+# Logging is configured from LOG_LEVEL / LOG_FORMAT, so only after .env has been loaded
+logger = get_logger("api")
+if loaded_env_path:
+    logger.info("Loaded environment from: %s", loaded_env_path)
+
+# Verify critical environment variables are loaded
+gemini_key = os.getenv("GEMINI_API_KEY")
+logger.info("GEMINI_API_KEY loaded: %s", 'Yes' if gemini_key else 'No')
 
 app = FastAPI(
     title="LinkedIn Sourcing Agent API",
@@ -61,14 +75,7 @@ app.add_middleware(
 try:
     app.mount("/static", StaticFiles(directory="static"), name="static")
 except Exception:
-    print("Static files directory not found - web interface disabled")
-
-@app.on_event("startup")
-async def startup_event():
-    """Ensure proper asyncio event loop policy on startup"""
-    if sys.platform == "win32":
-        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-    print("FastAPI startup complete with Windows asyncio policy set.")
+    logger.warning("Static files directory not found - web interface disabled")
 
 # I'm using a try-except block to handle the case where the session cookie is missing.
 # This is a critical piece of configuration for our custom parser.
@@ -78,13 +85,37 @@ try:
 except ValueError as e:
     # If the cookie is not set, the API will start but the endpoint will raise an error.
     agent = None
-    print(f"CRITICAL ERROR: Could not initialize SourcingAgent. {e}")
+    logger.critical("Could not initialize SourcingAgent. %s", e)
+
+@app.on_event("startup")
+async def startup_event():
+    """Ensure proper asyncio event loop policy on startup and warm up the shared browser"""
+    if sys.platform == "win32":
+        asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+    import_legacy_results()
+    await job_queue.start()
+    if agent:
+        try:
+            await agent.browser.start(warm_contexts=agent.scrape_concurrency)
+        except Exception as e:
+            # The browser is launched lazily on the first scrape if this fails
+            logger.warning("Could not start shared browser on startup: %s", e)
+    logger.info("FastAPI startup complete with Windows asyncio policy set.")
+
+@app.on_event("shutdown")
+async def shutdown_event():
+    """Stop the job workers and tear down the shared browser so no Chromium processes are left behind"""
+    await job_queue.stop()
+    if agent:
+        await agent.browser.stop()
 
 class SourcingRequest(BaseModel):
     job_description: str
     search_query: str = Field(default="", description="Optional custom search query. If empty, will be generated from job description")
     send_outreach: bool = False
     max_candidates: int = Field(default=10, ge=1, le=50, description="Maximum number of candidates to return")
+    concurrency: Optional[int] = Field(default=None, ge=1, le=8, description="Number of profiles scraped in parallel. Defaults to SCRAPE_CONCURRENCY")
+    batch_scoring: bool = Field(default=False, description="Score several candidates per LLM request to cut request count and input tokens")
 
 class JobDescriptionRequest(BaseModel):
     job_description: str
@@ -112,13 +143,13 @@ class SourcingResponse(BaseModel):
     status: str
     processing_time: Optional[float] = None
     search_query_used: Optional[str] = None
+    stage_timings: Optional[dict] = None
 
-# Storage for results
+# Results live in the jobs table of the SQLite store; this directory only holds
+# per-job JSON files written by older versions, imported on startup.
 RESULTS_DIR = "results"
-if not os.path.exists(RESULTS_DIR):
-    os.makedirs(RESULTS_DIR)
 
-async def run_agent_with_policy(job_description: str, search_query: str, send_outreach: bool = False, num_results: int = 10):
+async def run_agent_with_policy(job_description: str, search_query: str, send_outreach: bool = False, num_results: int = 10, concurrency: int = None, batch_scoring: bool = False, on_progress=None):
     """Wrapper to ensure Windows asyncio policy is set before running agent"""
     if sys.platform == "win32":
         asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
@@ -127,34 +158,61 @@ async def run_agent_with_policy(job_description: str, search_query: str, send_ou
         return await agent.run(job_description=job_description, 
                               search_query=search_query, 
                               send_outreach=send_outreach,
-                              num_results=num_results)
+                              num_results=num_results,
+                              concurrency=concurrency,
+                              batch_scoring=batch_scoring,
+                              on_progress=on_progress)
 
 def save_results(job_id: str, results: dict):
-    """Save results to JSON file"""
+    """Save results to the jobs table"""
     try:
-        file_path = os.path.join(RESULTS_DIR, f"{job_id}.json")
-        with open(file_path, 'w') as f:
-            json.dump(results, f, indent=2)
-        print(f"Results saved to {file_path}")
+        with database.SessionLocal() as session:
+            database.save_job_results(session, job_id, results)
+        logger.info("Results saved for job %s", job_id)
     except Exception as e:
-        print(f"Error saving results: {e}")
+        logger.error("Error saving results: %s", e)
 
 def load_results(job_id: str) -> Optional[dict]:
-    """Load results from JSON file"""
+    """Load results from the jobs table, falling back to a legacy JSON file"""
     try:
+        with database.SessionLocal() as session:
+            results = database.get_job_results(session, job_id)
+        if results:
+            return results
         file_path = os.path.join(RESULTS_DIR, f"{job_id}.json")
         if os.path.exists(file_path):
             with open(file_path, 'r') as f:
                 return json.load(f)
     except Exception as e:
-        print(f"Error loading results: {e}")
+        logger.error("Error loading results: %s", e)
     return None
 
-def format_results(raw_results: dict, job_description: str, processing_time: float = None, max_candidates: int = 10) -> dict:
+def import_legacy_results():
+    """One-time import of results/<job_id>.json files into the jobs table"""
+    if not os.path.isdir(RESULTS_DIR):
+        return
+    try:
+        with database.SessionLocal() as session:
+            known_ids = database.get_job_ids(session)
+            imported = 0
+            for filename in os.listdir(RESULTS_DIR):
+                job_id = filename[:-5]
+                if not filename.endswith('.json') or job_id in known_ids:
+                    continue
+                with open(os.path.join(RESULTS_DIR, filename), 'r') as f:
+                    database.save_job_results(session, job_id, json.load(f))
+                imported += 1
+        if imported:
+            logger.info("Imported %d legacy job results from %s/", imported, RESULTS_DIR)
+    except Exception as e:
+        logger.error("Error importing legacy results: %s", e)
+
+def format_results(raw_results: dict, job_description: str, processing_time: float = None, max_candidates: int = 10, job_id: str = None) -> dict:
     """Format and filter results to top N candidates"""
+    job_id = job_id or str(uuid.uuid4())
     if "results" not in raw_results:
         return {
-            "job_id": str(uuid.uuid4()),
+            "job_id": job_id,
             "job_description": job_description,
             "candidates_found": 0,
             "top_candidates": [],
@@ -162,7 +220,8 @@ def format_results(raw_results: dict, job_description: str, processing_time: flo
             "status": "error",
             "error": raw_results.get("error", "Unknown error"),
             "processing_time": processing_time,
-            "search_query_used": raw_results.get("search_query_used")
+            "search_query_used": raw_results.get("search_query_used"),
+            "stage_timings": raw_results.get("stage_timings")
         }
     
     # Filter out failed candidates and sort by fit_score
@@ -181,8 +240,6 @@ def format_results(raw_results: dict, job_description: str, processing_time: flo
     valid_candidates.sort(key=lambda x: x.get("fit_score", 0), reverse=True)
     top_candidates = valid_candidates[:max_candidates]
     
-    job_id = str(uuid.uuid4())
-    
     formatted_results = {
         "job_id": job_id,
         "job_description": job_description,
@@ -191,7 +248,8 @@ def format_results(raw_results: dict, job_description: str, processing_time: flo
         "top_candidates": top_candidates,
         "timestamp": datetime.now().isoformat(),
         "status": "completed",
-        "processing_time": processing_time
+        "processing_time": processing_time,
+        "stage_timings": raw_results.get("stage_timings")
     }
     
     # Save results
@@ -199,13 +257,33 @@ def format_results(raw_results: dict, job_description: str, processing_time: flo
     
     return formatted_results
 
+async def process_queued_job(job: dict) -> dict:
+    """Runs a queued sourcing job end to end and saves its results under the job's ID"""
+    params = job["params"]
+    start_time = time.time()
+    raw_results = await run_agent_with_policy(
+        job_description=params["job_description"],
+        search_query=params["search_query"] or None,
+        send_outreach=params["send_outreach"],
+        num_results=params["max_candidates"],
+        concurrency=params["concurrency"],
+        batch_scoring=params["batch_scoring"],
+        on_progress=job_queue.progress_callback(job)
+    )
+    processing_time = time.time() - start_time
+    return format_results(raw_results or {}, params["job_description"], processing_time, params["max_candidates"], job_id=job["job_id"])
+
+# Background jobs run on a bounded number of workers instead of unbounded BackgroundTasks
+job_queue = JobQueue(process_queued_job, max_workers=int(os.getenv("MAX_CONCURRENT_JOBS", "2")))
+
 # I'm updating the main endpoint to be asynchronous to support the async agent.
 @app.post("/run-sourcing-job/")
-async def run_sourcing_job(request: SourcingRequest, background_tasks: BackgroundTasks):
+async def run_sourcing_job(request: SourcingRequest):
     """
     This endpoint kicks off the full sourcing process.
     It requires a job description and a search query, and can optionally send outreach.
-    The actual processing is run in the background.
+    The job is queued and its ID returned immediately; poll /results/{job_id} for
+    its state, progress and partial results.
     """
     if not agent:
         raise HTTPException(
@@ -213,14 +291,15 @@ async def run_sourcing_job(request: SourcingRequest, background_tasks: Backgroun
             detail="Sourcing Agent is not available. Check server logs for initialization errors (e.g., missing LINKEDIN_SESSION_COOKIE)."
         )
 
-    # This will run the agent's main function in the background with proper asyncio policy
-    background_tasks.add_task(run_agent_with_policy, 
-                              job_description=request.job_description,
-                              search_query=request.search_query,
-                              send_outreach=request.send_outreach,
-                              num_results=request.max_candidates)
+    job = job_queue.submit(request.dict())
     
-    return {"message": "Sourcing job started in the background. Results will be processed and stored."}
+    return {
+        "message": "Sourcing job queued. Poll the status URL for progress and results.",
+        "job_id": job["job_id"],
+        "status": job["status"],
+        "queue_position": job_queue.depth,
+        "status_url": f"/results/{job['job_id']}"
+    }
 
 # NEW: Synchronous endpoint that returns results immediately
 @app.post("/run-sourcing-job-sync/", response_model=SourcingResponse)
@@ -235,6 +314,7 @@ async def run_sourcing_job_sync(request: SourcingRequest):
             detail="Sourcing Agent is not available. Check server logs for initialization errors (e.g., missing LINKEDIN_SESSION_COOKIE)."
         )
     
+    job_id = str(uuid.uuid4())
     try:
         start_time = time.time()
         
@@ -242,55 +322,152 @@ async def run_sourcing_job_sync(request: SourcingRequest):
         search_query = request.search_query or None
         
         # Run the agent synchronously
-        raw_results = await run_agent_with_policy(
-            job_description=request.job_description,
-            search_query=search_query,
-            send_outreach=request.send_outreach,
-            num_results=request.max_candidates
-        )
+        with log_context(job_id=job_id):
+            raw_results = await run_agent_with_policy(
+                job_description=request.job_description,
+                search_query=search_query,
+                send_outreach=request.send_outreach,
+                num_results=request.max_candidates,
+                concurrency=request.concurrency,
+                batch_scoring=request.batch_scoring
+            )
         
         processing_time = time.time() - start_time
         
         # Format and save results
-        formatted_results = format_results(raw_results, request.job_description, processing_time, request.max_candidates)
+        formatted_results = format_results(raw_results, request.job_description, processing_time, request.max_candidates, job_id=job_id)
         
         return formatted_results
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error processing sourcing job: {str(e)}")
 
+def format_stream_event(event: dict, stream_format: str) -> str:
+    """Serialize one streaming event as an NDJSON line or a server-sent event"""
+    payload = json.dumps(event, default=str)
+    if stream_format == "sse":
+        return f"event: {event['event']}\ndata: {payload}\n\n"
+    return payload + "\n"
+
+@app.post("/run-sourcing-job-stream/")
+async def run_sourcing_job_stream(request: SourcingRequest, format: str = "ndjson"):
+    """
+    Streaming variant of /run-sourcing-job-sync/. Emits each candidate's analysis as
+    soon as it is ready, followed by a final ranked summary, so the first candidate
+    arrives after a single profile's latency instead of after the whole job.
+
+    Events: started, search_complete, candidate (one per profile), summary or error.
+    Use ?format=sse for server-sent events; the default is NDJSON (one JSON object per line).
+    """
+    if not agent:
+        raise HTTPException(
+            status_code=503, 
+            detail="Sourcing Agent is not available. Check server logs for initialization errors (e.g., missing LINKEDIN_SESSION_COOKIE)."
+        )
+    if format not in ("ndjson", "sse"):
+        raise HTTPException(status_code=400, detail="format must be 'ndjson' or 'sse'")
+
+    loop = asyncio.get_running_loop()
+    events = asyncio.Queue()
+    job_id = str(uuid.uuid4())
+    start_time = time.time()
+
+    def on_progress(event: str, data):
+        # Candidate events arrive on the browser thread
+        loop.call_soon_threadsafe(events.put_nowait, (event, data))
+
+    async def run_job():
+        with log_context(job_id=job_id):
+            raw_results = await run_agent_with_policy(
+                job_description=request.job_description,
+                search_query=request.search_query or None,
+                send_outreach=request.send_outreach,
+                num_results=request.max_candidates,
+                concurrency=request.concurrency,
+                batch_scoring=request.batch_scoring,
+                on_progress=on_progress
+            )
+        return format_results(raw_results or {}, request.job_description, time.time() - start_time, request.max_candidates, job_id=job_id)
+
+    job_task = asyncio.create_task(run_job())
+
+    async def event_stream():
+        total = 0
+        received = 0
+
+        def to_event(event: str, data) -> dict:
+            nonlocal total, received
+            if event == "search_complete":
+                total = data.get("total", 0)
+                return {"event": event, **data}
+            received += 1
+            return {"event": event, "progress": {"received": received, "total": total}, "candidate": data}
+
+        try:
+            yield format_stream_event({"event": "started", "job_id": job_id}, format)
+            while True:
+                next_event = asyncio.ensure_future(events.get())
+                done, _ = await asyncio.wait({next_event, job_task}, return_when=asyncio.FIRST_COMPLETED)
+                if next_event not in done:
+                    next_event.cancel()
+                    break
+                yield format_stream_event(to_event(*next_event.result()), format)
+            # Flush anything queued right before the job finished
+            while not events.empty():
+                yield format_stream_event(to_event(*events.get_nowait()), format)
+
+            try:
+                summary = job_task.result()
+            except Exception as e:
+                yield format_stream_event({"event": "error", "job_id": job_id, "error": str(e)}, format)
+                return
+            yield format_stream_event({"event": "error" if summary.get("status") == "error" else "summary", **summary}, format)
+        finally:
+            # Client went away: stop scraping on its behalf
+            if not job_task.done():
+                job_task.cancel()
+
+    media_type = "text/event-stream" if format == "sse" else "application/x-ndjson"
+    return StreamingResponse(event_stream(), media_type=media_type, headers={"Cache-Control": "no-cache"})
+
 # NEW: Get results by job ID
 @app.get("/results/{job_id}")
 async def get_results(job_id: str):
     """
-    Retrieve results by job ID
+    Retrieve results by job ID. Jobs that are still queued or running return their
+    state, progress counts and the candidate results received so far.
     """
+    job = job_queue.get(job_id)
+    if job and job["status"] in ("queued", "running"):
+        return job_queue.describe(job)
     results = load_results(job_id)
-    if not results:
-        raise HTTPException(status_code=404, detail="Results not found")
-    return results
+    if results:
+        return results
+    if job:
+        # Failed before any results could be saved
+        return job_queue.describe(job)
+    raise HTTPException(status_code=404, detail="Results not found")
 
 # NEW: List all job results
 @app.get("/results/")
-async def list_results():
+async def list_results(
+    limit: int = Query(default=20, ge=1, le=100),
+    offset: int = Query(default=0, ge=0),
+    status: Optional[str] = Query(default=None, description="Only jobs with this status, e.g. completed or error"),
+    since: Optional[datetime] = Query(default=None, description="Only jobs created at or after this ISO timestamp")
+):
     """
-    List all available job results
+    List job results, newest first, one page at a time
     """
     try:
-        results = []
-        if os.path.exists(RESULTS_DIR):
-            for filename in os.listdir(RESULTS_DIR):
-                if filename.endswith('.json'):
-                    job_id = filename[:-5]  # Remove .json extension
-                    job_data = load_results(job_id)
-                    if job_data:
-                        results.append({
-                            "job_id": job_id,
-                            "timestamp": job_data.get("timestamp"),
-                            "candidates_found": job_data.get("candidates_found", 0),
-                            "status": job_data.get("status", "unknown")
-                        })
-        return {"jobs": results}
+        with database.SessionLocal() as session:
+            jobs, has_more = database.list_jobs(session, limit=limit, offset=offset, status=status, since=since)
+        return {
+            "jobs": jobs,
+            "limit": limit,
+            "offset": offset,
+            "next_offset": offset + limit if has_more else None
+        }
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Error listing results: {str(e)}")
 
@@ -379,6 +556,7 @@ async def find_candidates_with_outreach(request: JobDescriptionRequest):
                 "top_candidates": [],
                 "processing_time_seconds": processing_time,
                 "search_query_used": raw_results.get("search_query_used"),
+                "stage_timings": raw_results.get("stage_timings"),
                 "status": "no_candidates_found"
             }
         
@@ -432,6 +610,7 @@ async def find_candidates_with_outreach(request: JobDescriptionRequest):
             "total_candidates_found": len(valid_candidates),  
             "top_candidates": formatted_candidates,
             "processing_time_seconds": round(processing_time, 2),
+            "stage_timings": raw_results.get("stage_timings"),
             "status": "success",
             "timestamp": datetime.now().isoformat()
         }
@@ -450,9 +629,25 @@ async def health_check():
         "status": "healthy",
         "timestamp": datetime.now().isoformat(),
         "agent_available": agent is not None,
-        "results_directory": os.path.exists(RESULTS_DIR),
-        "total_jobs_processed": len(os.listdir(RESULTS_DIR)) if os.path.exists(RESULTS_DIR) else 0
     }
+    try:
+        with database.SessionLocal() as session:
+            status["total_jobs_processed"] = database.count_jobs(session)
+        status["results_store"] = True
+    except Exception as e:
+        status["total_jobs_processed"] = 0
+        status["results_store"] = False
+        status["results_store_error"] = str(e)
+    status["job_queue"] = {
+        "workers": job_queue.max_workers,
+        "queued": job_queue.depth,
+        "running": sum(1 for job in job_queue.jobs.values() if job["status"] == "running")
+    }
+    if agent:
+        status["candidate_cache"] = dict(agent.cache_stats, enabled=agent.use_cache)
+        status["llm"] = agent.llm.snapshot()
+        status["llm_prompts"] = dict(agent.prompt_stats)
+        status["network"] = dict(agent.network_stats, resource_blocking=agent.browser.block_resources)
     
     # Check environment variables
     required_env_vars = ["LINKEDIN_SESSION_COOKIE", "GOOGLE_API_KEY", "CUSTOM_SEARCH_ENGINE_ID", "GEMINI_API_KEY"]
@@ -463,6 +658,38 @@ async def health_check():
     
     return status
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """
+    Prometheus text exposition: job, profile, auth-wall, LLM and cache counters, LLM
+    latency and stage duration histograms, plus gauges read from live state
+    """
+    running = sum(1 for job in job_queue.jobs.values() if job["status"] == "running")
+    gauges = [
+        ("synapse_job_queue_depth", "Background jobs waiting for a worker", job_queue.depth),
+        ("synapse_jobs_running", "Background jobs being processed", running),
+        ("synapse_job_workers", "Background job workers", job_queue.max_workers)
+    ]
+    if agent:
+        gauges += [
+            ("synapse_browser_active_pages", "Browser pages currently scraping or sending outreach", agent.browser.active_pages),
+            ("synapse_llm_in_flight", "Gemini requests in flight", agent.llm.snapshot()["in_flight"])
+        ]
+    return PlainTextResponse(metrics.render_prometheus(gauges), media_type="text/plain; version=0.0.4; charset=utf-8")
+
+@app.get("/metrics/stages")
+async def stage_metrics():
+    """
+    Duration histograms (seconds) of every pipeline stage across all jobs since startup:
+    search_query, search, scrape_profile, navigation, readiness_wait, html_parse,
+    dom_extract, llm_analysis, llm_batch_analysis and outreach
+    """
+    return {
+        "timestamp": datetime.now().isoformat(),
+        "buckets": list(metrics.STAGE_BUCKETS),
+        "stages": metrics.stage_metrics.snapshot()
+    }
+
 # WEB INTERFACE
 @app.get("/web", response_class=HTMLResponse)
 async def web_interface():
@@ -540,6 +767,7 @@ async def web_interface():
             <p>This agent provides the following endpoints:</p>
             <ul>
                 <li><strong>POST /run-sourcing-job-sync/</strong> - Complete sourcing pipeline (recommended)</li>
+                <li><strong>POST /run-sourcing-job-stream/</strong> - Same pipeline, streams each candidate as NDJSON (or SSE with ?format=sse)</li>
                 <li><strong>POST /find-candidates-with-outreach/</strong> - Find top 10 candidates with outreach messages (NEW)</li>
                 <li><strong>POST /search-linkedin/</strong> - Find LinkedIn profiles only</li>
                 <li><strong>POST /score-candidates/</strong> - Score existing candidates</li>
@@ -724,7 +952,7 @@ async def web_interface():
                             <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(200px, 1fr)); gap: 10px;">
                                 <div><strong>Agent Status:</strong> ${agentIcon} ${health.agent_available ? 'Available' : 'Unavailable'}</div>
                                 <div><strong>Jobs Processed:</strong> ${health.total_jobs_processed}</div>
-                                <div><strong>Results Storage:</strong> ${health.results_directory ? '✅' : '❌'}</div>
+                                <div><strong>Results Storage:</strong> ${health.results_store ? '✅' : '❌'}</div>
                                 <div><strong>Timestamp:</strong> ${new Date(health.timestamp).toLocaleString()}</div>
                             </div>
                             ${health.warnings ? `<p style="margin-top: 15px;"><strong>⚠️ Warnings:</strong> ${health.warnings}</p>` : ''}
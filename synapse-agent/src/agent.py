@@ -1,12 +1,13 @@
 import os
 import json
 import asyncio
-import sys
-from concurrent.futures import ThreadPoolExecutor
+import uuid
+import threading
+import datetime
+import logging
+from collections import OrderedDict
 from dotenv import load_dotenv
-from google import genai
 from google.genai import types
-from playwright.async_api import async_playwright
 
 # Load environment variables from the .env file in the synapse-agent directory
 # Load from multiple possible locations to ensure it works
@@ -23,8 +24,177 @@ for env_path in env_paths:
 # Import tools with fallback for both package and direct execution
 try:
     from . import tools
+    from . import database
+    from . import metrics
+    from .logs import get_logger, log_context, current_job_id
+    from .browser import BrowserManager
+    from .llm import get_llm_client
 except ImportError:
     import tools
+    import database
+    import metrics
+    from logs import get_logger, log_context, current_job_id
+    from browser import BrowserManager
+    from llm import get_llm_client
+
+logger = get_logger("agent")
+
+# Shared by the single-candidate and batch scoring prompts
+FIT_SCORE_RUBRIC = """- **Education (20%):** Score 9-10 for elite schools (MIT, Stanford, CMU, etc.), 7-8 for other strong CS schools, 5-6 for standard universities.
+- **Career Trajectory (20%):** Score 8-10 for clear progression with promotions, 6-8 for steady growth, 3-5 for limited progression.
+- **Company Relevance (15%):** Score 9-10 for top tech/AI companies (Google, Meta, OpenAI), 7-8 for relevant tech startups, 5-6 for any software experience.
+- **Experience Match (25%):** Score 9-10 for direct experience training production LLMs or similar large NNs, 7-8 for strong ML research/engineering overlap, 5-6 for general backend experience.
+- **Location Match (10%):** Score 10 for Mountain View/Bay Area, 8 for same state/willing to relocate, 6 for remote-friendly profiles.
+- **Tenure (10%):** Score 9-10 for 2-4 years average tenure, 6-8 for 1-2 years, 3-5 for job hopping (<1 year).
+"""
+
+def _estimate_tokens(text: str) -> int:
+    """Cheap token estimate (~4 characters per token) used to size LLM batches."""
+    return len(text) // 4 + 1
+
+# Short keys of the line-oriented profile encoding; PROFILE_FORMAT explains them in prompts
+PROFILE_KEYS = {"name": "name", "headline": "hl", "linkedin_url": "url", "experience": "exp", "education": "edu"}
+PROFILE_FORMAT = "hl = headline, exp = Title @ Company (Duration), edu = School, Degree (Duration)"
+# Placeholders the extractor uses for fields it could not find
+_MISSING_VALUES = {"", "n/a", "none", "null", "unknown"}
+
+def _present(value) -> bool:
+    if isinstance(value, str):
+        return value.strip().lower() not in _MISSING_VALUES
+    return value not in (None, [], {})
+
+def _encode_entry(key: str, entry) -> str:
+    if not isinstance(entry, dict):
+        return str(entry).strip() if _present(entry) else ""
+    if key == "experience":
+        first, second = entry.get("title"), entry.get("company")
+        separator = " @ "
+    elif key == "education":
+        first, second = entry.get("school"), entry.get("degree")
+        separator = ", "
+    else:
+        return " | ".join(str(value).strip() for value in entry.values() if _present(value))
+    text = separator.join(str(part).strip() for part in (first, second) if _present(part))
+    if _present(entry.get("duration")):
+        duration = str(entry["duration"]).strip()
+        text = f"{text} ({duration})" if text else duration
+    return text
+
+def _encode_profile(profile_data: dict, include_url: bool = True) -> str:
+    """
+    Token-efficient profile for prompts: one "key: value" line per field and one line
+    per experience/education entry, with short keys (PROFILE_KEYS) and empty or
+    "N/A" values dropped. Replaces indented JSON, whose whitespace, quotes, repeated
+    keys and placeholders cost input tokens in every request.
+    """
+    lines = []
+    for field, value in profile_data.items():
+        if field == "error" or (field == "linkedin_url" and not include_url) or not _present(value):
+            continue
+        key = PROFILE_KEYS.get(field, field)
+        if isinstance(value, list):
+            lines.extend(f"{key}: {text}" for text in (_encode_entry(field, entry) for entry in value) if text)
+        elif isinstance(value, dict):
+            lines.append(f"{key}: " + ", ".join(f"{k}={v}" for k, v in value.items() if _present(v)))
+        else:
+            lines.append(f"{key}: {' '.join(str(value).split())}")
+    return "\n".join(lines)
+
+def _in_session(fn, *args):
+    """Runs fn(session, *args) in its own SQLite session; called through asyncio.to_thread."""
+    with database.SessionLocal() as session:
+        return fn(session, *args)
+
+class ProfileStore:
+    """
+    In-memory store of scraped profiles and analyses, with analyses grouped per job
+    (job description hash). It sits in front of the SQLite cache so that
+    /score-candidates/ and /generate-outreach/ reuse work done moments earlier for
+    the same job. Least recently used entries are evicted first. A disabled store
+    (CANDIDATE_CACHE_ENABLED=false) keeps nothing.
+    """
+    def __init__(self, max_profiles: int = 1000, max_jobs: int = 50, enabled: bool = True):
+        self.max_profiles = max_profiles
+        self.max_jobs = max_jobs
+        self.enabled = enabled
+        self._profiles = OrderedDict()  # url -> profile
+        self._analyses = OrderedDict()  # job_hash -> {url: analysis}
+        # Used from both the API loop and the browser thread
+        self._lock = threading.Lock()
+
+    def get_profile(self, url: str):
+        if not self.enabled:
+            return None
+        with self._lock:
+            profile = self._profiles.get(url)
+            if profile is not None:
+                self._profiles.move_to_end(url)
+            return profile
+
+    def put_profile(self, url: str, profile: dict, keep_analyses: bool = False):
+        """
+        Stores a profile. A re-scraped profile invalidates its analyses for every job,
+        as in database.cache_profile; keep_analyses is for profiles loaded from SQLite.
+        """
+        if not self.enabled:
+            return
+        with self._lock:
+            if not keep_analyses:
+                for job in self._analyses.values():
+                    job.pop(url, None)
+            self._profiles[url] = profile
+            self._profiles.move_to_end(url)
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+
+    def get_analysis(self, job_hash: str, url: str):
+        if not self.enabled:
+            return None
+        with self._lock:
+            job = self._analyses.get(job_hash)
+            if job is None:
+                return None
+            self._analyses.move_to_end(job_hash)
+            return job.get(url)
+
+    def put_analysis(self, job_hash: str, url: str, analysis: dict):
+        if not self.enabled:
+            return
+        with self._lock:
+            self._analyses.setdefault(job_hash, {})[url] = analysis
+            self._analyses.move_to_end(job_hash)
+            while len(self._analyses) > self.max_jobs:
+                self._analyses.popitem(last=False)
+
+class SearchCache:
+    """
+    In-memory LRU of Custom Search results in front of the SQLite Cache table.
+    Entries remember when they were fetched and expire after ttl_seconds.
+    """
+    def __init__(self, ttl_seconds: float, max_entries: int = 256):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries = OrderedDict()  # key -> (cached_at, urls)
+        self._lock = threading.Lock()
+
+    def get(self, key: str):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            cached_at, urls = entry
+            if datetime.datetime.utcnow() - cached_at > datetime.timedelta(seconds=self.ttl_seconds):
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return list(urls)
+
+    def put(self, key: str, urls: list, cached_at: datetime.datetime = None):
+        with self._lock:
+            self._entries[key] = (cached_at or datetime.datetime.utcnow(), list(urls))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
 
 class SourcingAgent:
     """
@@ -36,19 +206,56 @@ class SourcingAgent:
         gemini_api_key = os.environ.get("GEMINI_API_KEY")
         if not gemini_api_key:
             raise ValueError("The GEMINI_API_KEY is not set in the environment.")
-        # Create the client - it automatically picks up GEMINI_API_KEY from environment
-        self.client = genai.Client()
+        # Shared, pooled Gemini client (also used by tools.llm_call)
+        self.llm = get_llm_client()
         self.model_name = model
 
         self.session_cookie = os.environ.get("LINKEDIN_SESSION_COOKIE")
         if not self.session_cookie:
-            print("Warning: LINKEDIN_SESSION_COOKIE not set. The agent cannot run.")
+            logger.warning("LINKEDIN_SESSION_COOKIE not set. The agent cannot run.")
+
+        # One warm Chromium instance shared by every job; started/stopped by the API lifecycle
+        self.browser = BrowserManager(
+            session_cookie=self.session_cookie,
+            max_idle_contexts=int(os.environ.get("BROWSER_MAX_IDLE_CONTEXTS", "4"))
+        )
+
+        # SQLite cache of scraped profiles and per-job-description analyses (7-day freshness)
+        self.use_cache = os.environ.get("CANDIDATE_CACHE_ENABLED", "true").lower() != "false"
+        # Hot, in-process layer in front of SQLite shared by all endpoints
+        self.store = ProfileStore(enabled=self.use_cache)
+        self.cache_stats = {
+            "profile_hits": 0, "profile_misses": 0, "analysis_hits": 0, "analysis_misses": 0,
+            "search_hits": 0, "search_misses": 0
+        }
+        # Custom Search results are reused for identical (normalized) queries; 0 disables
+        self.search_cache = SearchCache(float(os.environ.get("SEARCH_CACHE_TTL_SECONDS", "21600")))
+        # Totals of the per-profile request/byte counters from the browser's resource filter
+        self.network_stats = {"profiles": 0, "requests": 0, "blocked": 0, "bytes": 0}
+
+        # Prompt size totals (estimated, and as counted by Gemini when it reports usage)
+        self.prompt_stats = {
+            "prompts": 0, "estimated_tokens": 0, "reported_tokens": 0,
+            "profile_tokens": 0, "profile_json_tokens": 0
+        }
+
+        # Batch scoring packs several profiles into one Gemini request, capped by size and tokens
+        self.batch_max_size = int(os.environ.get("LLM_BATCH_MAX_SIZE", "8"))
+        self.batch_max_tokens = int(os.environ.get("LLM_BATCH_MAX_TOKENS", "12000"))
 
+        # Number of browser pages scraping in parallel, overridable per job
+        self.scrape_concurrency = int(os.environ.get("SCRAPE_CONCURRENCY", "3"))
+        # Shared across jobs so concurrent workers never hammer LinkedIn
+        self.rate_limiter = tools.DomainRateLimiter(
+            float(os.environ.get("SCRAPE_MIN_INTERVAL_SECONDS", "2.0"))
+        )
+
+    @metrics.timed("search_query")
     async def _generate_search_query(self, job_description: str) -> str:
         """
         Uses the LLM to generate a concise, effective search query from a job description.
         """
-        print("Generating a targeted search query from the job description...")
+        logger.info("Generating a targeted search query from the job description...")
         try:
             prompt = f"""
             Analyze the following job description and distill it into a concise Google search query of 5-7 keywords to find relevant LinkedIn profiles.
@@ -71,106 +278,326 @@ class SourcingAgent:
 
             *Optimal Google Search Query:*
             """
-            response = self.client.models.generate_content(
+            response = await self.llm.agenerate(
+                prompt,
                 model=self.model_name,
-                contents=prompt,
                 config=types.GenerateContentConfig(
                     temperature=0.2,
                     max_output_tokens=50
                 )
             )
+            self._report_prompt("search_query", prompt, [], response)
             
             # Clean up the response
             query = response.text.strip().replace('"', '')
-            print(f"Generated Search Query: {query}")
+            logger.info("Generated search query: %s", query)
             return query
         except Exception as e:
-            print(f"Error generating search query: {e}")
+            logger.error("Error generating search query: %s", e)
             # Fallback to a simple query if generation fails
             return " ".join(job_description.split()[:10])
 
 
-    async def _run_playwright_scraping(self, profile_urls: list, job_description: str, send_outreach: bool):
+    async def _run_playwright_scraping(self, profile_urls: list, job_description: str, send_outreach: bool, concurrency: int = None, batch_scoring: bool = False, on_result=None):
         """
-        Run Playwright scraping in a way that's compatible with Windows asyncio
+        Runs the scraping pipeline on the shared browser's event loop. The browser thread
+        keeps Windows asyncio compatibility and the caller's loop is never blocked.
+
+        URLs are canonicalized first, so variants of one profile are scraped, analyzed
+        and cached once; the returned list still has one result per input URL.
         """
-        def run_in_new_loop():
-            # Set Windows policy for this thread
-            if sys.platform == "win32":
-                asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
-            
-            # Create new event loop for this thread
-            loop = asyncio.new_event_loop()
-            asyncio.set_event_loop(loop)
-            
+        canonical_urls = [tools.canonicalize_linkedin_url(url) for url in profile_urls]
+        unique_urls = list(dict.fromkeys(canonical_urls))
+        if len(unique_urls) < len(canonical_urls):
+            logger.info("Collapsed %d duplicate profile URLs", len(canonical_urls) - len(unique_urls))
+        results = await self.browser.run(
+            self._scrape_profiles_with_playwright(unique_urls, job_description, send_outreach, concurrency, batch_scoring, on_result)
+        )
+        results_by_url = dict(zip(unique_urls, results))
+        return [results_by_url[url] for url in canonical_urls]
+
+    async def _scrape_profiles_with_playwright(self, profile_urls: list, job_description: str, send_outreach: bool, concurrency: int = None, batch_scoring: bool = False, on_result=None):
+        """
+        The actual Playwright scraping logic, run as two overlapping stages. A bounded
+        pool of workers, each holding a warm page from the shared browser, pulls profile
+        URLs off a shared queue and scrapes them; every scraped profile is handed to a
+        background LLM analysis task so the page can move on to the next profile while
+        Gemini is still thinking. With batch_scoring, scraped profiles are grouped and
+        scored several per request instead. Results are returned in the same order as
+        profile_urls; on_result, if given, is called (on the browser thread) with each
+        candidate's result as soon as it is ready.
+        """
+        if not profile_urls:
+            return []
+
+        job_hash = database.job_description_hash(job_description)
+        results = [None] * len(profile_urls)
+
+        def set_result(index: int, result: dict):
+            results[index] = result
+            if on_result:
+                try:
+                    on_result(result)
+                except Exception as e:
+                    logger.warning("Progress callback failed: %s", e)
+
+        queue = asyncio.Queue()
+        for index, url in enumerate(profile_urls):
+            # Already analyzed for this job: no browser or LLM work needed
+            cached = await self._get_cached_analysis(url, job_hash)
+            if cached is not None:
+                set_result(index, cached)
+            else:
+                queue.put_nowait((index, url))
+
+        if queue.empty():
+            logger.info("All %d profiles served from cache", len(profile_urls))
+        else:
+            analysis_tasks = []
+            pending_batch = []
+            batch_budget = self.batch_max_tokens - _estimate_tokens(job_description + FIT_SCORE_RUBRIC)
+
+            async def analyze(index: int, profile_data: dict):
+                set_result(index, await self._analyze_candidate(profile_data, job_description, job_hash))
+
+            async def analyze_batch(batch: list):
+                # Created from whichever worker filled the batch; it covers several candidates
+                with log_context(candidate=None):
+                    analyses = await self._analyze_candidate_batch([profile for _, profile in batch], job_description, job_hash)
+                for (index, _), analysis in zip(batch, analyses):
+                    set_result(index, analysis)
+
+            batch_tokens = 0
+
+            def flush_batch():
+                nonlocal batch_tokens
+                if pending_batch:
+                    analysis_tasks.append(asyncio.create_task(analyze_batch(list(pending_batch))))
+                    pending_batch.clear()
+                    batch_tokens = 0
+
+            def add_to_batch(index: int, profile_data: dict):
+                nonlocal batch_tokens
+                tokens = _estimate_tokens(_encode_profile(profile_data))
+                if pending_batch and (len(pending_batch) >= self.batch_max_size or batch_tokens + tokens > batch_budget):
+                    flush_batch()
+                pending_batch.append((index, profile_data))
+                batch_tokens += tokens
+
+            async def worker(worker_id: int):
+                async with self.browser.page() as page:
+                    parser = tools.LinkedInParser(page, self.browser.resource_filter(page))
+                    while True:
+                        try:
+                            index, url = queue.get_nowait()
+                        except asyncio.QueueEmpty:
+                            return
+                        # Analysis tasks created here inherit the candidate's log context
+                        with log_context(candidate=url):
+                            logger.debug("Worker %d scraping profile", worker_id)
+                            profile_data = await self._scrape_candidate(parser, url)
+                            if profile_data.get("error"):
+                                set_result(index, profile_data["failure"])
+                            elif batch_scoring:
+                                add_to_batch(index, profile_data)
+                            else:
+                                analysis_tasks.append(asyncio.create_task(analyze(index, profile_data)))
+
+            concurrency = max(1, min(concurrency or self.scrape_concurrency, queue.qsize()))
+            logger.info("Scraping %d of %d profiles with %d concurrent pages", queue.qsize(), len(profile_urls), concurrency)
             try:
-                return loop.run_until_complete(self._scrape_profiles_with_playwright(profile_urls, job_description, send_outreach))
+                await asyncio.gather(*(worker(i) for i in range(concurrency)))
+                flush_batch()
+                await asyncio.gather(*analysis_tasks)
             finally:
-                loop.close()
-        
-        # Run in thread pool to avoid blocking
-        with ThreadPoolExecutor(max_workers=1) as executor:
-            future = executor.submit(run_in_new_loop)
-            return future.result()
+                # On cancellation or a worker error, stop the analyses nobody will wait for
+                # and collect their outcomes so no task exception goes unretrieved
+                for task in analysis_tasks:
+                    if not task.done():
+                        task.cancel()
+                await asyncio.gather(*analysis_tasks, return_exceptions=True)
 
-    async def _scrape_profiles_with_playwright(self, profile_urls: list, job_description: str, send_outreach: bool):
+        # Step 4 (Optional): Send Outreach, once every candidate has been analyzed
+        if send_outreach:
+            await self._send_outreach_batch(profile_urls, results, concurrency or self.scrape_concurrency)
+        return results
+
+    async def _scrape_candidate(self, parser, url: str) -> dict:
         """
-        The actual Playwright scraping logic
+        Returns the candidate's profile, from cache when possible. On failure the returned
+        dict carries an "error" and the "failure" result to report for this URL.
         """
+        profile_data = await self._get_cached_profile(url)
+        if profile_data is None:
+            await self.rate_limiter.wait(url)
+            profile_data = await parser.scrape_profile(url)
+            self._record_network_stats(parser.last_profile_stats)
+            if profile_data and not profile_data.get("error"):
+                metrics.profiles_scraped.inc()
+                self.store.put_profile(url, dict(profile_data))
+                await self._store_in_cache(database.cache_profile, url, profile_data)
+            else:
+                metrics.profiles_failed.inc()
+
+        if not profile_data or profile_data.get("error"):
+            logger.warning("Skipping analysis due to scraping error or empty profile.")
+            return {
+                "error": (profile_data or {}).get("error", "No data found"),
+                "failure": {
+                    "url": url,
+                    "status": "Failed to scrape or process",
+                    "details": (profile_data or {}).get("error", "No data found")
+                }
+            }
+
+        profile_data["linkedin_url"] = url # Ensure URL is in the data
+        return profile_data
+
+    def _record_network_stats(self, profile_stats: dict):
+        if not profile_stats:
+            return
+        self.network_stats["profiles"] += 1
+        for key in ("requests", "blocked", "bytes"):
+            self.network_stats[key] += profile_stats[key]
+
+    async def _analyze_candidate(self, profile_data: dict, job_description: str, job_hash: str) -> dict:
+        """Runs the LLM analysis for a scraped profile and caches successful results."""
+        logger.debug("Analyzing candidate: %s", profile_data.get('name'))
+        analysis_result = await self._get_llm_analysis(profile_data, job_description)
+        await self._record_analysis(profile_data["linkedin_url"], job_hash, analysis_result)
+        return analysis_result
+
+    async def _analyze_candidate_batch(self, profiles: list, job_description: str, job_hash: str) -> list:
+        """
+        Scores a batch of profiles with one LLM request. Candidates missing from the
+        batch response are scored individually so every profile gets an analysis.
+        """
+        logger.debug("Analyzing batch of %d candidates", len(profiles))
+        analyses = await self._get_llm_batch_analysis(profiles, job_description)
         results = []
-        
-        async with async_playwright() as p:
-            # Launch browser with Windows-compatible options
-            browser = await p.chromium.launch(
-                headless=True,
-                args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu']
-            )
-            page = await browser.new_page()
-            
-            # Set LinkedIn session cookie if available
-            if self.session_cookie:
-                await page.context.add_cookies([{
-                    'name': 'li_at',
-                    'value': self.session_cookie,
-                    'domain': '.linkedin.com',
-                    'path': '/'
-                }])
-                print("LinkedIn session cookie set")
-
-            parser = tools.LinkedInParser(page)
-            for url in profile_urls:
-                print(f"Scraping profile: {url}")
-                profile_data = await parser.scrape_profile(url)
-                
-                if profile_data and not profile_data.get("error"):
-                    profile_data["linkedin_url"] = url # Ensure URL is in the data
-                    print(f"Analyzing candidate: {profile_data.get('name')}")
-                    analysis_result = self._get_llm_analysis(profile_data, job_description)
-                    
-                    # Step 4 (Optional): Send Outreach
-                    if send_outreach and analysis_result.get("outreach_message"):
-                        print(f"Sending connection request to: {url}")
-                        success = await parser.send_connection_request(url, analysis_result["outreach_message"])
-                        analysis_result["outreach_sent"] = success
-                    
-                    results.append(analysis_result)
-                else:
-                    print(f"Skipping analysis for {url} due to scraping error or empty profile.")
-                    results.append({
-                        "url": url,
-                        "status": "Failed to scrape or process",
-                        "details": profile_data.get("error", "No data found")
-                    })
-                await asyncio.sleep(2) # Be respectful to LinkedIn's servers
-            await browser.close()
-        
+        for profile_data, analysis_result in zip(profiles, analyses):
+            if analysis_result is None:
+                metrics.llm_fallbacks.inc(kind="batch_to_single")
+                with log_context(candidate=profile_data["linkedin_url"]):
+                    analysis_result = await self._get_llm_analysis(profile_data, job_description)
+            await self._record_analysis(profile_data["linkedin_url"], job_hash, analysis_result)
+            results.append(analysis_result)
         return results
 
-    def _get_llm_analysis(self, profile_data: dict, job_description: str) -> dict:
+    async def _record_analysis(self, url: str, job_hash: str, analysis_result: dict):
+        if not analysis_result.get("analysis_error"):
+            self.store.put_analysis(job_hash, url, dict(analysis_result))
+            await self._store_in_cache(database.cache_analysis, url, job_hash, analysis_result)
+
+    async def _send_outreach_batch(self, profile_urls: list, results: list, concurrency: int):
+        """Sends connection requests for every analyzed candidate using the shared page pool."""
+        queue = asyncio.Queue()
+        for url, result in zip(profile_urls, results):
+            if isinstance(result, dict) and result.get("outreach_message"):
+                queue.put_nowait((url, result))
+        if queue.empty():
+            return
+
+        async def worker():
+            async with self.browser.page() as page:
+                parser = tools.LinkedInParser(page, self.browser.resource_filter(page))
+                while True:
+                    try:
+                        url, result = queue.get_nowait()
+                    except asyncio.QueueEmpty:
+                        return
+                    with log_context(candidate=url):
+                        logger.info("Sending connection request")
+                        await self.rate_limiter.wait(url)
+                        result["outreach_sent"] = await parser.send_connection_request(url, result["outreach_message"])
+
+        await asyncio.gather(*(worker() for _ in range(max(1, min(concurrency, queue.qsize())))))
+
+    async def _search_profile_urls(self, search_query: str, num_results: int) -> list:
+        """
+        Custom Search with two cache layers in front: the in-memory LRU, then the SQLite
+        Cache table. Only complete, non-empty results are cached: a result missing pages
+        that failed would otherwise hide those candidates for the whole TTL.
+        """
+        if self.search_cache.ttl_seconds <= 0:
+            urls, _ = await tools.search_linkedin_pages(search_query, num_results)
+            return urls
+
+        key = database.search_cache_key(search_query, num_results)
+        urls = self.search_cache.get(key)
+        if urls is None:
+            try:
+                cached = await asyncio.to_thread(_in_session, database.get_cached_search, key, self.search_cache.ttl_seconds)
+                if cached is not None:
+                    urls, cached_at = cached
+                    self.search_cache.put(key, urls, cached_at)
+            except Exception as e:
+                logger.warning("Search cache lookup failed: %s", e)
+
+        self.cache_stats["search_hits" if urls is not None else "search_misses"] += 1
+        metrics.cache_lookups.inc(cache="search", result="hit" if urls is not None else "miss")
+        if urls is not None:
+            logger.info("Using cached search results for: %s", search_query)
+            return urls
+
+        urls, complete = await tools.search_linkedin_pages(search_query, num_results)
+        if urls and complete:
+            self.search_cache.put(key, urls)
+            try:
+                await asyncio.to_thread(_in_session, database.cache_search, key, urls)
+            except Exception as e:
+                logger.warning("Failed to cache search results: %s", e)
+        return urls
+
+    async def _get_cached_profile(self, url: str):
+        """Looks up a scraped profile in the in-memory store, then in SQLite."""
+        profile = self.store.get_profile(url)
+        if profile is None and self.use_cache:
+            try:
+                profile = await asyncio.to_thread(_in_session, database.get_cached_profile, url)
+            except Exception as e:
+                logger.warning("Candidate cache lookup failed for %s: %s", url, e)
+            if profile is not None:
+                self.store.put_profile(url, profile, keep_analyses=True)
+        self.cache_stats["profile_hits" if profile else "profile_misses"] += 1
+        metrics.cache_lookups.inc(cache="profile", result="hit" if profile else "miss")
+        if profile:
+            logger.debug("Using cached profile for %s", url)
+        # Copy so callers can annotate it without mutating the cached entry
+        return dict(profile) if profile else None
+
+    async def _get_cached_analysis(self, url: str, job_hash: str):
+        """Looks up this job's analysis of a profile in the in-memory store, then in SQLite."""
+        analysis = self.store.get_analysis(job_hash, url)
+        if analysis is None and self.use_cache:
+            try:
+                analysis = await asyncio.to_thread(_in_session, database.get_cached_analysis, url, job_hash)
+            except Exception as e:
+                logger.warning("Analysis cache lookup failed for %s: %s", url, e)
+            if analysis is not None:
+                self.store.put_analysis(job_hash, url, analysis)
+        self.cache_stats["analysis_hits" if analysis else "analysis_misses"] += 1
+        metrics.cache_lookups.inc(cache="analysis", result="hit" if analysis else "miss")
+        if analysis:
+            logger.debug("Using cached analysis for %s", url)
+        return dict(analysis) if analysis else None
+
+    async def _store_in_cache(self, cache_fn, *args):
+        if not self.use_cache:
+            return
+        try:
+            await asyncio.to_thread(_in_session, cache_fn, *args)
+        except Exception as e:
+            logger.warning("Could not write to candidate cache: %s", e)
+
+    @metrics.timed("llm_analysis")
+    async def _get_llm_analysis(self, profile_data: dict, job_description: str) -> dict:
         """
         Analyzes the structured profile data against the job description using a single, comprehensive LLM prompt.
+        Uses the async Gemini client so the event loop keeps scraping while the request is in flight.
         """
-        profile_text = json.dumps(profile_data, indent=2)
+        # The URL has its own line below, so it is left out of the profile block
+        profile_text = _encode_profile(profile_data, include_url=False)
         profile_url = profile_data.get("linkedin_url", "N/A") # Assuming the URL is passed in profile_data
 
         master_prompt = f"""
@@ -182,20 +609,14 @@ You are an expert AI Talent Sourcer. Your task is to analyze a candidate's struc
 **Candidate's Profile URL:**
 {profile_url}
 
-**Candidate's Profile Data (JSON):**
+**Candidate's Profile Data** ({PROFILE_FORMAT}):
 {profile_text}
 
 **Your Task:**
 Analyze the candidate's profile and return a single JSON object with the following structure. Do not include any text outside of the JSON object.
 
 **Fit Score Rubric:**
-- **Education (20%):** Score 9-10 for elite schools (MIT, Stanford, CMU, etc.), 7-8 for other strong CS schools, 5-6 for standard universities.
-- **Career Trajectory (20%):** Score 8-10 for clear progression with promotions, 6-8 for steady growth, 3-5 for limited progression.
-- **Company Relevance (15%):** Score 9-10 for top tech/AI companies (Google, Meta, OpenAI), 7-8 for relevant tech startups, 5-6 for any software experience.
-- **Experience Match (25%):** Score 9-10 for direct experience training production LLMs or similar large NNs, 7-8 for strong ML research/engineering overlap, 5-6 for general backend experience.
-- **Location Match (10%):** Score 10 for Mountain View/Bay Area, 8 for same state/willing to relocate, 6 for remote-friendly profiles.
-- **Tenure (10%):** Score 9-10 for 2-4 years average tenure, 6-8 for 1-2 years, 3-5 for job hopping (<1 year).
-
+{FIT_SCORE_RUBRIC}
 **Required JSON Output Format:**
 {{
   "name": "{profile_data.get('name', 'N/A')}",
@@ -215,93 +636,210 @@ Analyze the candidate's profile and return a single JSON object with the followi
 }}
 """
         try:
-            response = self.client.models.generate_content(
+            response = await self.llm.agenerate(
+                master_prompt,
                 model=self.model_name,
-                contents=master_prompt,
                 config=types.GenerateContentConfig(
                     temperature=0.2,
                     response_mime_type="application/json"
                 )
             )
+            self._report_prompt("analysis", master_prompt, [profile_data], response)
             # The response should be a JSON object now
             response_text = response.text.strip()
             return json.loads(response_text)
         except Exception as e:
-            print(f"Error during LLM analysis for {profile_url}: {e}")
+            logger.warning("Error during LLM analysis for %s: %s", profile_url, e)
             # Fallback to the general llm_call if the structured one fails
-            fallback_response = tools.llm_call(master_prompt)
+            metrics.llm_fallbacks.inc(kind="llm_call")
+            fallback_response = await asyncio.to_thread(tools.llm_call, master_prompt)
             if fallback_response:
                 try:
                     return json.loads(fallback_response)
                 except json.JSONDecodeError as json_err:
-                    print(f"JSON decode error in fallback: {json_err}")
-                    # Return a basic structure with the available data
-                    return {
-                        "name": profile_data.get('name', 'N/A'),
-                        "linkedin_url": profile_url,
-                        "fit_score": 5.0,
-                        "score_breakdown": {
-                            "education": 5.0,
-                            "trajectory": 5.0,
-                            "company": 5.0,
-                            "skills": 5.0,
-                            "location": 5.0,
-                            "tenure": 5.0
-                        },
-                        "reasoning": "Could not analyze profile due to LLM processing error",
-                        "confidence_score": 0.1,
-                        "outreach_message": f"Hi {profile_data.get('name', 'there')}, I came across your profile and would love to connect!"
-                    }
-            else:
-                # Return basic fallback structure
-                return {
-                    "name": profile_data.get('name', 'N/A'),
-                    "linkedin_url": profile_url,
-                    "fit_score": 5.0,
-                    "score_breakdown": {
-                        "education": 5.0,
-                        "trajectory": 5.0,
-                        "company": 5.0,
-                        "skills": 5.0,
-                        "location": 5.0,
-                        "tenure": 5.0
-                    },
-                    "reasoning": "Could not analyze profile due to LLM processing error",
-                    "confidence_score": 0.1,
-                    "outreach_message": f"Hi {profile_data.get('name', 'there')}, I came across your profile and would love to connect!"
-                }
+                    logger.warning("JSON decode error in fallback: %s", json_err)
+            # Return a basic structure with the available data
+            return self._fallback_analysis(profile_data, profile_url)
+
+    def _report_prompt(self, kind: str, prompt: str, profiles: list, response=None):
+        """
+        Token report for one prompt: Gemini's own prompt token count when the response
+        carries usage metadata, the local estimate otherwise. With DEBUG logging it also
+        measures how many tokens the compact profile encoding saved compared to indented
+        JSON, which means re-encoding every profile both ways.
+        """
+        estimated = _estimate_tokens(prompt)
+        usage = getattr(response, "usage_metadata", None)
+        reported = getattr(usage, "prompt_token_count", None) or 0
+        self.prompt_stats["prompts"] += 1
+        self.prompt_stats["estimated_tokens"] += estimated
+        self.prompt_stats["reported_tokens"] += reported
+        metrics.llm_prompt_tokens.inc(reported or estimated, kind=kind)
+        if not logger.isEnabledFor(logging.DEBUG):
+            return
+
+        profile_tokens = sum(_estimate_tokens(_encode_profile(profile)) for profile in profiles)
+        json_tokens = sum(_estimate_tokens(json.dumps(profile, indent=2)) for profile in profiles)
+        self.prompt_stats["profile_tokens"] += profile_tokens
+        self.prompt_stats["profile_json_tokens"] += json_tokens
+        metrics.llm_profile_tokens_saved.inc(max(0, json_tokens - profile_tokens))
+        logger.debug("%s prompt: %d tokens (%s), %d profile(s) in ~%d tokens vs ~%d as JSON",
+                     kind, reported or estimated, "reported" if reported else "estimated",
+                     len(profiles), profile_tokens, json_tokens)
 
-    async def run(self, job_description: str, search_query: str, send_outreach: bool = False, num_results: int = 10):
+    @metrics.timed("llm_batch_analysis")
+    async def _get_llm_batch_analysis(self, profiles: list, job_description: str) -> list:
+        """
+        Scores several candidates in one structured-JSON request, sending the job
+        description and rubric once. Returns one analysis per profile, in order, with
+        None for any candidate the response did not cover.
+        """
+        candidates_text = "\n\n".join(
+            f"[{i}]\n{_encode_profile(profile)}" for i, profile in enumerate(profiles)
+        )
+        batch_prompt = f"""
+You are an expert AI Talent Sourcer. Your task is to analyze several candidates' structured profile data against a specific job description and return a structured JSON array.
+
+**Job Description:**
+{job_description}
+
+**Candidates** (one block per candidate, headed by its [candidate_id]; {PROFILE_FORMAT}):
+{candidates_text}
+
+**Your Task:**
+Score every candidate independently using the rubric below and return a JSON array with exactly one object per candidate. Do not include any text outside of the JSON array.
+
+**Fit Score Rubric:**
+{FIT_SCORE_RUBRIC}
+
+**Required JSON Output Format (one element per candidate):**
+[
+  {{
+    "candidate_id": 0,
+    "name": "Candidate's name from the profile",
+    "linkedin_url": "Candidate's linkedin_url from the profile",
+    "fit_score": "Calculate the final weighted score from 1.0 to 10.0",
+    "score_breakdown": {{"education": 0.0, "trajectory": 0.0, "company": 0.0, "skills": 0.0, "location": 0.0, "tenure": 0.0}},
+    "reasoning": "A concise paragraph explaining your scoring decisions, referencing specific details from their profile.",
+    "confidence_score": "A float from 0.0 to 1.0 indicating your confidence based on the completeness of the profile data.",
+    "outreach_message": "A personalized, professional 3-4 sentence LinkedIn message. Reference a specific project or company from their profile and connect it to the job. Mention the role title from the job description."
+  }}
+]
+"""
+        analyses = [None] * len(profiles)
+        try:
+            response = await self.llm.agenerate(
+                batch_prompt,
+                model=self.model_name,
+                config=types.GenerateContentConfig(
+                    temperature=0.2,
+                    response_mime_type="application/json"
+                )
+            )
+            self._report_prompt("batch_analysis", batch_prompt, profiles, response)
+            parsed = json.loads(response.text.strip())
+        except Exception as e:
+            logger.error("Error during batch LLM analysis of %d candidates: %s", len(profiles), e)
+            return analyses
+
+        if isinstance(parsed, dict):
+            parsed = parsed.get("candidates", [parsed])
+        index_by_url = {profile.get("linkedin_url"): i for i, profile in enumerate(profiles)}
+        for item in parsed if isinstance(parsed, list) else []:
+            if not isinstance(item, dict):
+                continue
+            index = item.pop("candidate_id", None)
+            if not isinstance(index, int) or not 0 <= index < len(profiles):
+                index = index_by_url.get(item.get("linkedin_url"))
+            if index is not None and analyses[index] is None:
+                # Trust the URL we scraped over whatever the model echoed back
+                item["linkedin_url"] = profiles[index].get("linkedin_url")
+                analyses[index] = item
+        return analyses
+
+    def _fallback_analysis(self, profile_data: dict, profile_url: str) -> dict:
+        """
+        Neutral analysis returned when the LLM could not score a candidate. It is
+        flagged with analysis_error so it never ends up in the candidate cache.
+        """
+        metrics.llm_fallbacks.inc(kind="neutral_score")
+        return {
+            "name": profile_data.get('name', 'N/A'),
+            "linkedin_url": profile_url,
+            "fit_score": 5.0,
+            "score_breakdown": {
+                "education": 5.0,
+                "trajectory": 5.0,
+                "company": 5.0,
+                "skills": 5.0,
+                "location": 5.0,
+                "tenure": 5.0
+            },
+            "reasoning": "Could not analyze profile due to LLM processing error",
+            "confidence_score": 0.1,
+            "outreach_message": f"Hi {profile_data.get('name', 'there')}, I came across your profile and would love to connect!",
+            "analysis_error": True
+        }
+
+    async def run(self, job_description: str, search_query: str, send_outreach: bool = False, num_results: int = 10, concurrency: int = None, batch_scoring: bool = False, on_progress=None):
         """
         The main pipeline: search, scrape, analyze, and optionally send outreach.
         Now using threaded approach for Windows compatibility.
+        on_progress(event, data), if given, receives ("search_complete", {...}) once the
+        candidate URLs are known and ("candidate", result) per candidate. Candidate
+        events are delivered from the browser thread.
+        The response carries "stage_timings": per-stage span statistics for this job.
+        Log records carry the caller's job ID, or a new one when run outside a job.
         """
+        metrics.jobs_started.inc()
+        try:
+            with log_context(job_id=current_job_id() or uuid.uuid4().hex[:12]), metrics.track_job() as timings:
+                response = await self._run_pipeline(job_description, search_query, send_outreach, num_results, concurrency, batch_scoring, on_progress)
+        except asyncio.CancelledError:
+            metrics.jobs_completed.inc(status="cancelled")
+            raise
+        except Exception:
+            metrics.jobs_completed.inc(status="error")
+            raise
+        # A search without profile URLs returns only a "message"; keep it apart from failures
+        if "results" in response:
+            metrics.jobs_completed.inc(status="completed")
+        else:
+            metrics.jobs_completed.inc(status="error" if "error" in response else "empty")
+        response["stage_timings"] = timings.summary()
+        return response
+
+    async def _run_pipeline(self, job_description: str, search_query: str, send_outreach: bool, num_results: int, concurrency: int, batch_scoring: bool, on_progress):
         if not self.session_cookie:
             return {"error": "Sourcing Agent is not available. Check server logs for initialization errors (e.g., missing LINKEDIN_SESSION_COOKIE)."}
 
-        print("Starting the sourcing process...")
+        logger.info("Starting the sourcing process...")
         
         # Step 1: Generate search query if not provided
         if not search_query:
-            print("No search query provided, generating one from job description...")
+            logger.info("No search query provided, generating one from job description...")
             search_query = await self._generate_search_query(job_description)
-            print(f"Generated search query: {search_query}")
+            logger.info("Using search query: %s", search_query)
 
         # Step 2: Find candidate URLs
-        profile_urls = await tools.search_linkedin_urls(search_query, num_results)
+        # Search results are canonical already; this also covers entries cached before that
+        profile_urls = tools.dedupe_linkedin_urls(await self._search_profile_urls(search_query, num_results))
         if not profile_urls:
-            print("No LinkedIn profile URLs found.")
+            logger.info("No LinkedIn profile URLs found.")
             return {"message": "No LinkedIn profile URLs found for the given query."}
 
-        print(f"Found {len(profile_urls)} candidate profiles. Starting scraping and analysis...")
+        logger.info("Found %d candidate profiles. Starting scraping and analysis...", len(profile_urls))
+        if on_progress:
+            on_progress("search_complete", {"total": len(profile_urls), "search_query": search_query})
+        on_result = (lambda result: on_progress("candidate", result)) if on_progress else None
 
         # Step 3 & 4: Scrape and Analyze using threaded approach for Windows compatibility
         try:
-            results = await self._run_playwright_scraping(profile_urls, job_description, send_outreach)
-            print("Sourcing process completed.")
+            results = await self._run_playwright_scraping(profile_urls, job_description, send_outreach, concurrency, batch_scoring, on_result)
+            logger.info("Sourcing process completed.")
             return {"results": results, "search_query_used": search_query}
         except Exception as e:
-            print(f"An error occurred during Playwright operations: {e}")
+            logger.exception("An error occurred during Playwright operations: %s", e)
             return {"error": f"Failed to process candidates due to a browser automation error: {e}"}
 
     async def search_linkedin(self, job_description: str, num_results: int = 10):
@@ -311,7 +849,7 @@ Analyze the candidate's profile and return a single JSON object with the followi
         Returns: [{"name": "John Doe", "linkedin_url": "...", "headline": "..."}]
         """
         search_query = f"site:linkedin.com/in/ \"{job_description[:100]}\""
-        profile_urls = await tools.search_linkedin_urls(search_query, num_results)
+        profile_urls = tools.dedupe_linkedin_urls(await self._search_profile_urls(search_query, num_results))
         
         candidates = []
         for url in profile_urls:
@@ -328,26 +866,27 @@ Analyze the candidate's profile and return a single JSON object with the followi
         # 3. Fit Scoring
         Score candidates against job requirements
         Returns: [{"name": "...", "score": 8.5, "breakdown": {...}}]
+        Profiles already analyzed for this job are reused; the rest are scraped in one session.
         """
-        scored_results = []
+        candidates = [candidate for candidate in candidates if "linkedin_url" in candidate]
+        if not candidates:
+            return []
+
+        raw_results = await self._run_playwright_scraping(
+            [candidate['linkedin_url'] for candidate in candidates], job_description, False
+        )
         
-        for candidate in candidates:
-            if "linkedin_url" in candidate:
-                # Use the existing scraping and analysis pipeline
-                search_query = f"site:linkedin.com {candidate['linkedin_url']}"
-                raw_results = await self._run_playwright_scraping([candidate['linkedin_url']], job_description, False)
-                
-                if raw_results and len(raw_results) > 0:
-                    result = raw_results[0]
-                    if isinstance(result, dict) and "fit_score" in result:
-                        scored_results.append({
-                            "name": result.get("name", candidate.get("name", "Unknown")),
-                            "score": result.get("fit_score", 0),
-                            "breakdown": result.get("score_breakdown", {}),
-                            "linkedin_url": candidate["linkedin_url"],
-                            "reasoning": result.get("reasoning", ""),
-                            "confidence_score": result.get("confidence_score", 0)
-                        })
+        scored_results = []
+        for candidate, result in zip(candidates, raw_results):
+            if isinstance(result, dict) and "fit_score" in result:
+                scored_results.append({
+                    "name": result.get("name", candidate.get("name", "Unknown")),
+                    "score": result.get("fit_score", 0),
+                    "breakdown": result.get("score_breakdown", {}),
+                    "linkedin_url": candidate["linkedin_url"],
+                    "reasoning": result.get("reasoning", ""),
+                    "confidence_score": result.get("confidence_score", 0)
+                })
         
         return scored_results
 
@@ -356,22 +895,24 @@ Analyze the candidate's profile and return a single JSON object with the followi
         # 4. Message Generation
         Generate personalized outreach messages
         Returns: [{"candidate": "...", "message": "Hi John, I noticed..."}]
+        Reuses analyses from earlier scoring of the same job instead of re-scraping.
         """
-        messages = []
+        candidates = [candidate for candidate in candidates if "linkedin_url" in candidate]
+        if not candidates:
+            return []
+
+        raw_results = await self._run_playwright_scraping(
+            [candidate['linkedin_url'] for candidate in candidates], job_description, False
+        )
         
-        for candidate in candidates:
-            if "linkedin_url" in candidate:
-                # Use the existing pipeline to get outreach message
-                raw_results = await self._run_playwright_scraping([candidate['linkedin_url']], job_description, False)
-                
-                if raw_results and len(raw_results) > 0:
-                    result = raw_results[0]
-                    if isinstance(result, dict) and "outreach_message" in result:
-                        messages.append({
-                            "candidate": result.get("name", candidate.get("name", "Unknown")),
-                            "linkedin_url": candidate["linkedin_url"],
-                            "message": result.get("outreach_message", ""),
-                            "fit_score": result.get("fit_score", 0)
-                        })
+        messages = []
+        for candidate, result in zip(candidates, raw_results):
+            if isinstance(result, dict) and "outreach_message" in result:
+                messages.append({
+                    "candidate": result.get("name", candidate.get("name", "Unknown")),
+                    "linkedin_url": candidate["linkedin_url"],
+                    "message": result.get("outreach_message", ""),
+                    "fit_score": result.get("fit_score", 0)
+                })
         
         return messages
@@ -0,0 +1,263 @@
+import asyncio
+import os
+import sys
+import threading
+import weakref
+from contextlib import asynccontextmanager
+from urllib.parse import urlparse
+from playwright.async_api import async_playwright
+
+try:
+    from .logs import get_logger
+except ImportError:
+    from logs import get_logger
+
+logger = get_logger("browser")
+
+# Only the DOM text of a profile is used, so these never need to be downloaded
+BLOCK_RESOURCES = os.environ.get("BLOCK_RESOURCES", "true").lower() != "false"
+BLOCKED_RESOURCE_TYPES = os.environ.get("BLOCKED_RESOURCE_TYPES", "image,media,font")
+BLOCKED_DOMAINS = os.environ.get(
+    "BLOCKED_DOMAINS",
+    "google-analytics.com,googletagmanager.com,doubleclick.net,googlesyndication.com,"
+    "px.ads.linkedin.com,snap.licdn.com,bat.bing.com,connect.facebook.net,"
+    "demdex.net,omtrdc.net,hotjar.com,scorecardresearch.com"
+)
+# Hosts that are never blocked, whatever their resource type (e.g. "media.licdn.com")
+ALLOWED_DOMAINS = os.environ.get("ALLOWED_DOMAINS", "")
+
+def _split_list(value: str) -> set:
+    return {item.strip().lower() for item in value.split(",") if item.strip()}
+
+def _host_matches(host: str, domains: set) -> bool:
+    return any(host == domain or host.endswith("." + domain) for domain in domains)
+
+class ResourceFilter:
+    """
+    Playwright route handler for one page: aborts requests for blocked resource
+    types and domains, lets everything else through and counts the traffic.
+    Counters are reset by the scraper before each profile, so a snapshot after
+    scraping describes exactly one profile load.
+    """
+    def __init__(self, blocked_types: set = None, blocked_domains: set = None, allowed_domains: set = None):
+        self.blocked_types = _split_list(BLOCKED_RESOURCE_TYPES) if blocked_types is None else blocked_types
+        self.blocked_domains = _split_list(BLOCKED_DOMAINS) if blocked_domains is None else blocked_domains
+        self.allowed_domains = _split_list(ALLOWED_DOMAINS) if allowed_domains is None else allowed_domains
+        self.reset()
+
+    def reset(self):
+        self.stats = {"requests": 0, "blocked": 0, "bytes": 0, "blocked_by_type": {}}
+
+    def should_block(self, resource_type: str, url: str) -> bool:
+        host = urlparse(url).hostname or ""
+        if _host_matches(host, self.allowed_domains):
+            return False
+        return resource_type in self.blocked_types or _host_matches(host, self.blocked_domains)
+
+    async def handle(self, route):
+        request = route.request
+        self.stats["requests"] += 1
+        if self.should_block(request.resource_type, request.url):
+            self.stats["blocked"] += 1
+            by_type = self.stats["blocked_by_type"]
+            by_type[request.resource_type] = by_type.get(request.resource_type, 0) + 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    async def on_request_finished(self, request):
+        # Transfer size of each completed download (headers + encoded body)
+        try:
+            sizes = await request.sizes()
+            self.stats["bytes"] += sizes["responseHeadersSize"] + max(sizes["responseBodySize"], 0)
+        except Exception:
+            pass
+
+    def snapshot(self) -> dict:
+        return dict(self.stats, blocked_by_type=dict(self.stats["blocked_by_type"]))
+
+class BrowserManager:
+    """
+    Owns a single long-lived Chromium instance for the whole server process.
+
+    Playwright objects are bound to the event loop that created them, so the
+    browser lives on a dedicated thread with its own (Windows-compatible) loop.
+    Scraping coroutines are submitted to that loop with `run`, which awaits them
+    without blocking the caller's loop. Pages are handed out from a pool of warm
+    browser contexts that already carry the LinkedIn `li_at` session cookie, and
+    each page routes its requests through a ResourceFilter.
+    """
+    def __init__(self, session_cookie: str = None, max_idle_contexts: int = 4, headless: bool = True):
+        self.session_cookie = session_cookie
+        self.max_idle_contexts = max_idle_contexts
+        self.headless = headless
+
+        self._loop = None
+        self._thread = None
+        self._thread_lock = threading.Lock()
+        self._playwright = None
+        self._browser = None
+        self._launch_lock = None
+        self._idle = []  # (context, page) pairs ready for reuse
+        self.block_resources = BLOCK_RESOURCES
+        self._filters = weakref.WeakKeyDictionary()  # page -> ResourceFilter
+        self.active_pages = 0  # pages currently handed out by page()
+
+    def _ensure_loop(self):
+        """Starts the browser thread and its event loop if they are not running yet."""
+        with self._thread_lock:
+            if self._loop is not None:
+                return self._loop
+
+            ready = threading.Event()
+
+            def run_loop():
+                # Set Windows policy for this thread
+                if sys.platform == "win32":
+                    asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+                loop = asyncio.new_event_loop()
+                asyncio.set_event_loop(loop)
+                self._launch_lock = asyncio.Lock()
+                self._loop = loop
+                ready.set()
+                try:
+                    loop.run_forever()
+                finally:
+                    loop.close()
+
+            self._thread = threading.Thread(target=run_loop, name="playwright-browser", daemon=True)
+            self._thread.start()
+            ready.wait()
+            return self._loop
+
+    async def run(self, coro):
+        """
+        Runs a coroutine on the browser loop and awaits its result from the calling loop.
+        """
+        loop = self._ensure_loop()
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        return await asyncio.wrap_future(future)
+
+    async def start(self, warm_contexts: int = 0):
+        """
+        Launches the shared browser ahead of the first request (called on API startup)
+        and optionally pre-creates authenticated contexts so the first job starts warm.
+        """
+        await self.run(self._warm_up(warm_contexts))
+        logger.info("Shared Chromium instance is ready (%d warm contexts)", len(self._idle))
+
+    async def _warm_up(self, warm_contexts: int):
+        await self._ensure_browser()
+        pairs = [await self._new_context() for _ in range(min(warm_contexts, self.max_idle_contexts))]
+        for context, page in pairs:
+            await self.release(context, page)
+
+    async def stop(self):
+        """Closes all contexts, the browser and Playwright, then stops the browser thread."""
+        if self._loop is None:
+            return
+        try:
+            await self.run(self._shutdown())
+        finally:
+            loop, thread = self._loop, self._thread
+            self._loop = None
+            self._thread = None
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout=10)
+        logger.info("Shared Chromium instance stopped")
+
+    async def _ensure_browser(self):
+        """Launches (or relaunches after a crash) the shared browser. Runs on the browser loop."""
+        async with self._launch_lock:
+            if self._browser and self._browser.is_connected():
+                return self._browser
+
+            if self._playwright is None:
+                self._playwright = await async_playwright().start()
+            self._idle = []
+            # Launch browser with Windows-compatible options
+            self._browser = await self._playwright.chromium.launch(
+                headless=self.headless,
+                args=['--no-sandbox', '--disable-dev-shm-usage', '--disable-gpu']
+            )
+            return self._browser
+
+    async def _shutdown(self):
+        for context, _ in self._idle:
+            try:
+                await context.close()
+            except Exception:
+                pass
+        self._idle = []
+        if self._browser:
+            try:
+                await self._browser.close()
+            except Exception as e:
+                logger.warning("Error closing browser: %s", e)
+            self._browser = None
+        if self._playwright:
+            await self._playwright.stop()
+            self._playwright = None
+
+    async def _new_context(self):
+        browser = await self._ensure_browser()
+        context = await browser.new_context()
+        # Set LinkedIn session cookie if available
+        if self.session_cookie:
+            await context.add_cookies([{
+                'name': 'li_at',
+                'value': self.session_cookie,
+                'domain': '.linkedin.com',
+                'path': '/'
+            }])
+        page = await context.new_page()
+        if self.block_resources:
+            resource_filter = ResourceFilter()
+            await page.route("**/*", resource_filter.handle)
+            page.on("requestfinished", resource_filter.on_request_finished)
+            self._filters[page] = resource_filter
+        return context, page
+
+    def resource_filter(self, page):
+        """The page's ResourceFilter (None when resource blocking is disabled)."""
+        return self._filters.get(page)
+
+    async def acquire(self):
+        """Returns a warm (context, page) pair. Must be called on the browser loop."""
+        while self._idle:
+            context, page = self._idle.pop()
+            if not page.is_closed() and self._browser and self._browser.is_connected():
+                return context, page
+            try:
+                await context.close()
+            except Exception:
+                pass
+        return await self._new_context()
+
+    async def release(self, context, page, reusable: bool = True):
+        """Returns a pair to the pool, or closes it if the pool is full or the page is unusable."""
+        if reusable and not page.is_closed() and len(self._idle) < self.max_idle_contexts:
+            self._idle.append((context, page))
+            return
+        try:
+            await context.close()
+        except Exception:
+            pass
+
+    @asynccontextmanager
+    async def page(self):
+        """
+        Async context manager handing out a page from a warm, authenticated context.
+        Pages that raised while in use are discarded instead of being recycled.
+        """
+        context, page = await self.acquire()
+        reusable = True
+        self.active_pages += 1
+        try:
+            yield page
+        except BaseException:
+            reusable = False
+            raise
+        finally:
+            self.active_pages -= 1
+            await self.release(context, page, reusable)
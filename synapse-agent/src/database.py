@@ -1,6 +1,9 @@
 import datetime
+import hashlib
+import json
+import unicodedata
 import sqlalchemy
-from sqlalchemy import create_engine, Column, Integer, String, Text, JSON, DateTime
+from sqlalchemy import create_engine, Column, Integer, Float, String, Text, JSON, DateTime
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 
@@ -23,6 +26,18 @@ class Candidate(Base):
     analysis_json = Column(JSON)
     last_updated = Column(DateTime, default=datetime.datetime.utcnow)
 
+class Job(Base):
+    """Results of one sourcing job, with summary columns indexed for listing."""
+    __tablename__ = "jobs"
+    job_id = Column(String, primary_key=True)
+    status = Column(String, index=True)
+    created_at = Column(DateTime, index=True)
+    candidates_found = Column(Integer, default=0)
+    processing_time = Column(Float)
+    search_query = Column(String)
+    job_description = Column(Text)
+    results_json = Column(JSON)
+
 Base.metadata.create_all(bind=engine)
 
 def get_db():
@@ -53,3 +68,151 @@ def cache_candidate(session, url: str, text: str, analysis: dict):
         )
         session.add(candidate)
     session.commit()
+
+def job_description_hash(job_description: str) -> str:
+    """Stable key for a job description, insensitive to case and whitespace changes."""
+    normalized = " ".join(job_description.split()).lower()
+    return hashlib.sha256(normalized.encode("utf-8")).hexdigest()[:16]
+
+def get_cached_profile(session, url: str):
+    """Returns the scraped profile dict for a fresh cache entry, or None."""
+    candidate = get_cached_candidate(session, url)
+    if candidate and candidate.scraped_text:
+        try:
+            return json.loads(candidate.scraped_text)
+        except json.JSONDecodeError:
+            return None
+    return None
+
+def get_cached_analysis(session, url: str, job_hash: str):
+    """Returns the analysis of a fresh cache entry for the given job description hash, or None."""
+    candidate = get_cached_candidate(session, url)
+    if candidate and isinstance(candidate.analysis_json, dict):
+        return candidate.analysis_json.get(job_hash)
+    return None
+
+def cache_profile(session, url: str, profile: dict):
+    """
+    Stores a freshly scraped profile. Analyses are keyed by job description hash in
+    analysis_json and are dropped here, since they were computed from the old profile.
+    """
+    candidate = session.query(Candidate).filter(Candidate.linkedin_url == url).first()
+    if candidate:
+        candidate.scraped_text = json.dumps(profile)
+        candidate.analysis_json = {}
+        candidate.last_updated = datetime.datetime.utcnow()
+    else:
+        candidate = Candidate(
+            linkedin_url=url,
+            scraped_text=json.dumps(profile),
+            analysis_json={}
+        )
+        session.add(candidate)
+    session.commit()
+
+def cache_analysis(session, url: str, job_hash: str, analysis: dict):
+    """Adds an analysis for one job description to an already cached profile."""
+    candidate = session.query(Candidate).filter(Candidate.linkedin_url == url).first()
+    if not candidate:
+        return
+    analyses = dict(candidate.analysis_json or {})
+    analyses[job_hash] = analysis
+    # Reassign so SQLAlchemy notices the change to the JSON column
+    candidate.analysis_json = analyses
+    session.commit()
+
+def normalize_search_query(query: str) -> str:
+    """
+    Canonical form of a search query: Unicode-normalized, lowercase (Custom Search
+    is case-insensitive) and with whitespace collapsed, so trivially different
+    generated queries share one cache entry.
+    """
+    return " ".join(unicodedata.normalize("NFKC", query).lower().split())
+
+def search_cache_key(query: str, num_results: int) -> str:
+    return f"linkedin-search:{num_results}:{normalize_search_query(query)}"
+
+def get_cached_search(session, key: str, ttl_seconds: float):
+    """
+    Returns (urls, cached_at) for a search cached less than ttl_seconds ago, or None.
+    The Cache row's result holds {"cached_at": ISO timestamp, "urls": [...]}.
+    """
+    entry = session.query(Cache).filter(Cache.query == key).first()
+    if not entry or not entry.result:
+        return None
+    try:
+        cached = json.loads(entry.result)
+        cached_at = datetime.datetime.fromisoformat(cached["cached_at"])
+    except (json.JSONDecodeError, KeyError, TypeError, ValueError):
+        return None
+    if datetime.datetime.utcnow() - cached_at > datetime.timedelta(seconds=ttl_seconds):
+        return None
+    return cached.get("urls", []), cached_at
+
+def cache_search(session, key: str, urls: list, cached_at: datetime.datetime = None):
+    cached_at = cached_at or datetime.datetime.utcnow()
+    result = json.dumps({"cached_at": cached_at.isoformat(), "urls": urls})
+    entry = session.query(Cache).filter(Cache.query == key).first()
+    if entry:
+        entry.result = result
+    else:
+        session.add(Cache(query=key, result=result))
+    session.commit()
+
+def _parse_timestamp(value):
+    try:
+        return datetime.datetime.fromisoformat(value)
+    except (TypeError, ValueError):
+        return datetime.datetime.now()
+
+def save_job_results(session, job_id: str, results: dict):
+    """Inserts or replaces a job's results, keeping the summary columns in sync."""
+    job = session.get(Job, job_id)
+    if job is None:
+        job = Job(job_id=job_id)
+        session.add(job)
+    job.status = results.get("status", "unknown")
+    job.created_at = _parse_timestamp(results.get("timestamp"))
+    job.candidates_found = results.get("candidates_found", 0)
+    job.processing_time = results.get("processing_time")
+    job.search_query = results.get("search_query_used")
+    job.job_description = results.get("job_description")
+    job.results_json = results
+    session.commit()
+
+def get_job_results(session, job_id: str):
+    job = session.get(Job, job_id)
+    return job.results_json if job else None
+
+def list_jobs(session, limit: int = 20, offset: int = 0, status: str = None, since: datetime.datetime = None):
+    """
+    Returns one page of job summaries, newest first, plus whether more pages exist.
+    Only the summary columns are read, so the cost depends on the page size rather
+    than on the number or size of stored jobs.
+    """
+    query = session.query(
+        Job.job_id, Job.created_at, Job.candidates_found, Job.status, Job.search_query, Job.processing_time
+    )
+    if status:
+        query = query.filter(Job.status == status)
+    if since:
+        # Stored timestamps are naive local times
+        if since.tzinfo is not None:
+            since = since.astimezone().replace(tzinfo=None)
+        query = query.filter(Job.created_at >= since)
+    rows = query.order_by(Job.created_at.desc()).offset(offset).limit(limit + 1).all()
+    jobs = [{
+        "job_id": row.job_id,
+        "timestamp": row.created_at.isoformat() if row.created_at else None,
+        "candidates_found": row.candidates_found or 0,
+        "status": row.status or "unknown",
+        "search_query_used": row.search_query,
+        "processing_time": row.processing_time
+    } for row in rows[:limit]]
+    return jobs, len(rows) > limit
+
+def count_jobs(session) -> int:
+    return session.query(sqlalchemy.func.count(Job.job_id)).scalar() or 0
+
+def get_job_ids(session) -> set:
+    return {job_id for (job_id,) in session.query(Job.job_id)}
@@ -0,0 +1,616 @@
+import logging
+import os
+import re
+from bisect import bisect_left
+from bs4 import BeautifulSoup, Tag
+
+try:
+    from .logs import get_logger
+except ImportError:
+    from logs import get_logger
+
+logger = get_logger("extractor")
+
+# Optional faster parser backends; html.parser is always available
+try:
+    import lxml  # noqa: F401 - only needed as a BeautifulSoup tree builder
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+try:
+    from selectolax.lexbor import LexborHTMLParser
+    SELECTOLAX_AVAILABLE = True
+except ImportError:
+    SELECTOLAX_AVAILABLE = False
+
+# Which parser builds the document tree: "html.parser" (default), "lxml" or "selectolax"
+PARSER_BACKEND = os.environ.get("PROFILE_PARSER_BACKEND", "html.parser").lower()
+
+# Where profile fields are extracted: "html" ships page.content() to Python and parses it,
+# "dom" runs DOM_EXTRACTOR_JS inside the page and only transfers the extracted records
+EXTRACTION_MODE = os.environ.get("PROFILE_EXTRACTION_MODE", "html").lower()
+
+# Selectors tried in order for the candidate's name and headline (first non-empty match wins)
+NAME_SELECTORS = [
+    'h1.text-heading-xlarge',
+    'h1[data-test="profile-title"]',
+    '.profile-info__name',
+    '.top-card-layout__title',
+    'h1.top-card-layout__title',
+    '.pv-text-details__title',
+    'h1',  # Generic h1 as fallback
+    '.artdeco-entity-lockup__title'
+]
+
+HEADLINE_SELECTORS = [
+    'div.text-body-medium',
+    '.top-card-layout__headline',
+    '.pv-text-details__title-text',
+    '.profile-info__headline',
+    '.text-body-medium.break-words',
+    '[data-generated-suggestion-target]'
+]
+
+# Class fragments identifying list items and the elements inside them
+EXPERIENCE_ITEM_CLASSES = ['pvs-entity', 'experience-item', 'entity-result', 'profile-section-card']
+EDUCATION_ITEM_CLASSES = ['pvs-entity', 'education-item', 'entity-result', 'profile-section-card']
+TITLE_CLASSES = ['entity-result__title', 't-16', 't-bold', 'profile-section-card__title']
+SUBTITLE_CLASSES = ['entity-result__subtitle', 't-14', 'profile-section-card__subtitle']
+
+TITLE_KEYWORDS = ['engineer', 'developer', 'manager', 'analyst', 'director', 'ceo', 'founder', 'lead']
+COMPANY_KEYWORDS = ['inc', 'corp', 'company', 'ltd', 'llc']
+EXPERIENCE_DURATION_KEYWORDS = ['year', 'month', 'present', '2020', '2021', '2022', '2023', '2024', '2025']
+JOB_KEYWORDS = TITLE_KEYWORDS + ['software', 'python', 'machine learning', 'full-time', 'part-time']
+
+SCHOOL_KEYWORDS = ['university', 'college', 'institute', 'school']
+DEGREE_KEYWORDS = ['bachelor', 'master', 'phd', 'degree', 'engineering', 'science', 'arts']
+EDUCATION_DURATION_KEYWORDS = ['year', 'month', '2015', '2016', '2017', '2018', '2019', '2020', '2021', '2022', '2023', '2024', '2025']
+UNIVERSITY_KEYWORDS = [
+    'harvard', 'stanford', 'mit', 'yale', 'princeton', 'caltech', 'columbia', 'upenn', 'dartmouth', 'brown',
+    'cornell', 'duke', 'northwestern', 'johns hopkins', 'chicago', 'berkeley', 'ucla', 'usc', 'nyu',
+    'university', 'college', 'institute', 'school of', 'tech', 'iit', 'bits'
+]
+
+# tag.class1.class2[attr="value"] - the only selector shapes the lists above use
+_SIMPLE_SELECTOR = re.compile(r'^([a-zA-Z][\w-]*)?((?:\.[\w-]+)*)(?:\[([\w-]+)(?:="([^"]*)")?\])?$')
+
+# BeautifulSoup's get_text() leaves out the contents of these tags
+_NON_TEXT_TAGS = ('script', 'style', 'template')
+
+class SoupTree:
+    """Document tree built by BeautifulSoup with the html.parser or lxml tree builder."""
+    def __init__(self, content: str, features: str = 'html.parser'):
+        self.backend = features
+        self.root = BeautifulSoup(content, features)
+
+    def walk(self):
+        """
+        Yields (element, tag name, attributes) when an element starts and None when
+        the most recently started element ends, in document order.
+        """
+        stack = [iter(self.root.contents)]
+        while stack:
+            for child in stack[-1]:
+                if isinstance(child, Tag):
+                    yield child, child.name, child.attrs
+                    stack.append(iter(child.contents))
+                    break
+            else:
+                stack.pop()
+                if stack:
+                    yield None
+
+    def text(self, element, separator: str = '', strip: bool = False) -> str:
+        return element.get_text(separator=separator, strip=strip)
+
+    def select_one(self, selector: str):
+        return self.root.select_one(selector)
+
+class SelectolaxTree:
+    """
+    Document tree built by selectolax's lexbor parser (C, several times faster than
+    html.parser). Text is collected with BeautifulSoup's get_text() rules so both
+    trees feed the extraction heuristics the same strings.
+    """
+    backend = 'selectolax'
+
+    def __init__(self, content: str):
+        self.root = LexborHTMLParser(content).root
+
+    def walk(self):
+        if self.root is None:
+            return
+        yield self.root, self.root.tag, self.root.attributes
+        stack = [self.root.iter()]
+        while stack:
+            for child in stack[-1]:
+                yield child, child.tag, child.attributes
+                stack.append(child.iter())
+                break
+            else:
+                stack.pop()
+                yield None
+
+    def text(self, element, separator: str = '', strip: bool = False) -> str:
+        pieces = []
+        for node in element.traverse(include_text=True):
+            if node.tag != '-text' or node.parent.tag in _NON_TEXT_TAGS:
+                continue
+            value = node.text_content
+            if strip:
+                value = value.strip()
+                if not value:
+                    continue
+            pieces.append(value)
+        return separator.join(pieces)
+
+    def select_one(self, selector: str):
+        return self.root.css_first(selector) if self.root is not None else None
+
+def parse_document(content: str, backend: str = None):
+    """
+    Parses a page with the configured backend. Missing optional parsers fall back
+    to html.parser so a misconfigured deployment still scrapes.
+    """
+    backend = (backend or PARSER_BACKEND).lower()
+    if backend == 'selectolax':
+        if SELECTOLAX_AVAILABLE:
+            return SelectolaxTree(content)
+        logger.warning("selectolax is not installed, falling back to html.parser")
+    elif backend == 'lxml':
+        if LXML_AVAILABLE:
+            return SoupTree(content, 'lxml')
+        logger.warning("lxml is not installed, falling back to html.parser")
+    elif backend != 'html.parser':
+        logger.warning("Unknown parser backend '%s', falling back to html.parser", backend)
+    return SoupTree(content, 'html.parser')
+
+class ProfileIndex:
+    """
+    Document index built in a single walk over a parsed LinkedIn profile page.
+
+    Every element gets a position in document order plus the end of its subtree,
+    so "descendants of X" is a range of positions. Elements are indexed by tag,
+    class token and attribute name, and the class-based groups the extraction
+    heuristics care about (list items, title/subtitle spans) are collected up
+    front. Section texts are computed at most once and shared between the
+    experience and education lookups.
+    """
+    def __init__(self, tree):
+        self.tree = tree
+        self.elements = []  # position -> element
+        self.ends = []  # position -> end of the element's subtree (exclusive)
+        self.names = []
+        self.attrs = []
+        self.classes = []
+        self.by_tag = {}
+        self.by_class = {}
+        self.by_attr = {}
+        self.sections = []
+        self.experience_items = []
+        self.education_items = []
+        self.title_elements = []
+        self.subtitle_elements = []
+        self.entity_divs = []
+        self._section_texts = {}
+        self._build()
+
+    def _build(self):
+        open_elements = []
+        for event in self.tree.walk():
+            if event is None:
+                self.ends[open_elements.pop()] = len(self.elements)
+            else:
+                open_elements.append(self._add(*event))
+
+    def _add(self, element, name, attrs):
+        pos = len(self.elements)
+        self.elements.append(element)
+        self.ends.append(pos + 1)
+        self.names.append(name)
+        self.attrs.append(attrs)
+        self.by_tag.setdefault(name, []).append(pos)
+        for attr in attrs:
+            self.by_attr.setdefault(attr, []).append(pos)
+
+        if name == 'section':
+            self.sections.append(pos)
+
+        # html.parser/lxml split class into a list, selectolax keeps the raw string
+        classes = attrs.get('class') or []
+        if isinstance(classes, str):
+            classes = classes.split()
+        self.classes.append(classes)
+        if not classes:
+            return pos
+        for cls in classes:
+            self.by_class.setdefault(cls, []).append(pos)
+
+        class_text = " ".join(classes).lower()
+        if name in ('li', 'div'):
+            if any(cls in class_text for cls in EXPERIENCE_ITEM_CLASSES):
+                self.experience_items.append(pos)
+            if any(cls in class_text for cls in EDUCATION_ITEM_CLASSES):
+                self.education_items.append(pos)
+        if name in ('span', 'div', 'a') and any(cls in class_text for cls in TITLE_CLASSES):
+            self.title_elements.append(pos)
+        if name in ('span', 'div') and any(cls in class_text for cls in SUBTITLE_CLASSES):
+            self.subtitle_elements.append(pos)
+        if name == 'div' and 'pvs-entity' in class_text:
+            self.entity_divs.append(pos)
+        return pos
+
+    def text(self, element, separator: str = '', strip: bool = False) -> str:
+        return self.tree.text(element, separator=separator, strip=strip)
+
+    def descendants(self, positions: list, pos: int) -> list:
+        """Positions from a sorted index that lie inside the element at `pos`."""
+        start = bisect_left(positions, pos + 1)
+        stop = bisect_left(positions, self.ends[pos])
+        return positions[start:stop]
+
+    def first_descendant(self, positions: list, pos: int):
+        found = self.descendants(positions, pos)
+        return self.elements[found[0]] if found else None
+
+    def section_text(self, pos: int) -> str:
+        text = self._section_texts.get(pos)
+        if text is None:
+            text = self._section_texts[pos] = self.text(self.elements[pos])
+        return text
+
+    def find_sections(self, keyword: str) -> list:
+        """
+        Sections whose id contains the lowercase keyword or, if there are none,
+        sections whose text mentions the capitalized heading (e.g. "Experience").
+        """
+        by_id = [pos for pos in self.sections
+                 if keyword in (self.attrs[pos].get('id') or '').lower()]
+        if by_id:
+            return by_id
+        heading = keyword.capitalize()
+        return [pos for pos in self.sections if heading in self.section_text(pos)]
+
+    def select_one(self, selector: str):
+        """First element matching a simple selector, in document order."""
+        match = _SIMPLE_SELECTOR.match(selector)
+        if not match:
+            return self.tree.select_one(selector)
+        tag, class_part, attr, value = match.groups()
+        classes = [cls for cls in class_part.split('.') if cls]
+
+        if classes:
+            candidates = self.by_class.get(classes[0], [])
+        elif attr:
+            candidates = self.by_attr.get(attr, [])
+        else:
+            candidates = self.by_tag.get(tag, [])
+
+        for pos in candidates:
+            if tag and self.names[pos] != tag:
+                continue
+            if len(classes) > 1 and not all(cls in self.classes[pos] for cls in classes[1:]):
+                continue
+            if attr:
+                attrs = self.attrs[pos]
+                if attr not in attrs:
+                    continue
+                if value is not None:
+                    attr_value = attrs[attr]
+                    if isinstance(attr_value, list):
+                        attr_value = " ".join(attr_value)
+                    if (attr_value or '') != value:
+                        continue
+            return self.elements[pos]
+        return None
+
+def _first_text(index: ProfileIndex, selectors: list, label: str) -> str:
+    for selector in selectors:
+        element = index.select_one(selector)
+        if element:
+            text = index.text(element, strip=True)
+            if text:
+                logger.debug("Found %s '%s' with selector: %s", label, text, selector)
+                return text
+    return "N/A"
+
+def _item_lines(index: ProfileIndex, item) -> list:
+    full_text = index.text(item, separator='|', strip=True)
+    return [line.strip() for line in full_text.split('|') if line.strip()]
+
+def _parse_experience_item(index: ProfileIndex, pos: int):
+    lines = _item_lines(index, index.elements[pos])
+
+    title = "N/A"
+    company = "N/A"
+    duration = "N/A"
+
+    for i, line in enumerate(lines):
+        lowered = line.lower()
+        # Title is usually first or contains job keywords
+        if i == 0 or any(keyword in lowered for keyword in TITLE_KEYWORDS):
+            if title == "N/A":
+                title = line
+        # Company is often after title or contains company indicators
+        elif any(keyword in lowered for keyword in COMPANY_KEYWORDS) or (i == 1 and company == "N/A"):
+            company = line
+        # Duration contains time indicators
+        elif any(keyword in lowered for keyword in EXPERIENCE_DURATION_KEYWORDS) and duration == "N/A":
+            duration = line
+
+    # Alternative: Look for specific elements inside the item
+    if title == "N/A":
+        title_elem = index.first_descendant(index.title_elements, pos)
+        if title_elem:
+            title = index.text(title_elem, strip=True)
+
+    if company == "N/A":
+        company_elem = index.first_descendant(index.subtitle_elements, pos)
+        if company_elem:
+            company = index.text(company_elem, strip=True)
+
+    if title != "N/A" and len(title) > 2:
+        return {"title": title, "company": company, "duration": duration}
+    return None
+
+def _parse_education_item(index: ProfileIndex, pos: int):
+    lines = _item_lines(index, index.elements[pos])
+
+    school = "N/A"
+    degree = "N/A"
+    duration = "N/A"
+
+    for i, line in enumerate(lines):
+        lowered = line.lower()
+        # School is usually first or contains university keywords
+        if i == 0 or any(keyword in lowered for keyword in SCHOOL_KEYWORDS):
+            if school == "N/A":
+                school = line
+        # Degree contains education keywords
+        elif any(keyword in lowered for keyword in DEGREE_KEYWORDS) and degree == "N/A":
+            degree = line
+        # Duration contains time indicators
+        elif any(keyword in lowered for keyword in EDUCATION_DURATION_KEYWORDS) and duration == "N/A":
+            duration = line
+
+    # Alternative: Look for specific elements inside the item
+    if school == "N/A":
+        school_elem = index.first_descendant(index.title_elements, pos)
+        if school_elem:
+            school = index.text(school_elem, strip=True)
+
+    if degree == "N/A":
+        degree_elem = index.first_descendant(index.subtitle_elements, pos)
+        if degree_elem:
+            degree = index.text(degree_elem, strip=True)
+
+    if school != "N/A" and len(school) > 2:
+        return {"school": school, "degree": degree, "duration": duration}
+    return None
+
+def _loose_entries(index: ProfileIndex, keywords: list, keys: tuple) -> list:
+    """Fallback: first lines of any pvs-entity div mentioning one of the keywords."""
+    entries = []
+    for pos in index.entity_divs[:10]:
+        text_content = index.text(index.elements[pos], strip=True)
+        if any(keyword in text_content.lower() for keyword in keywords):
+            lines = [line.strip() for line in text_content.replace('\n', '|').split('|') if line.strip()]
+            if lines:
+                entries.append({
+                    keys[0]: lines[0],
+                    keys[1]: lines[1] if len(lines) > 1 else "N/A",
+                    keys[2]: lines[2] if len(lines) > 2 else "N/A"
+                })
+                logger.debug("Found alternative %s: %s", keys[0], lines[0])
+    return entries
+
+def _extract_entries(index: ProfileIndex, keyword: str, items: list, limit: int, parse_item) -> list:
+    sections = index.find_sections(keyword)
+    logger.debug("Found %d potential %s sections", len(sections), keyword)
+
+    entries = []
+    for section in sections:
+        section_items = index.descendants(items, section)
+        for pos in section_items[:limit]:
+            try:
+                entry = parse_item(index, pos)
+            except (AttributeError, TypeError) as e:
+                logger.warning("Error parsing %s item: %s", keyword, e)
+                continue
+            if entry:
+                entries.append(entry)
+    return entries
+
+def extract_profile(content: str, backend: str = None, tree=None) -> dict:
+    """
+    Extracts name, headline, experience and education from a profile page's HTML.
+
+    The page is parsed (with `backend`, default PROFILE_PARSER_BACKEND) and indexed
+    once; all lookups below read from that index instead of re-walking the
+    document per selector and per section. A pre-parsed `tree` skips parsing.
+    """
+    if tree is None:
+        tree = parse_document(content, backend)
+    index = ProfileIndex(tree)
+
+    name = _first_text(index, NAME_SELECTORS, "name")
+    if name == "N/A":
+        logger.info("Could not find candidate name with any selector")
+        if logger.isEnabledFor(logging.DEBUG):
+            h1_tags = index.by_tag.get('h1', [])
+            logger.debug("Found %d h1 tags on page", len(h1_tags))
+            for i, pos in enumerate(h1_tags[:3]):  # Log first 3 h1 tags
+                logger.debug("H1 %d: %s", i + 1, index.text(index.elements[pos], strip=True)[:100])
+
+    headline = _first_text(index, HEADLINE_SELECTORS, "headline")
+
+    experience = _extract_entries(index, "experience", index.experience_items, 5, _parse_experience_item)
+    if not experience:
+        logger.debug("No structured experience found, trying alternative approach...")
+        experience = _loose_entries(index, JOB_KEYWORDS, ("title", "company", "duration"))
+    logger.debug("Found %d experience entries", len(experience))
+
+    education = _extract_entries(index, "education", index.education_items, 3, _parse_education_item)
+    if not education:
+        logger.debug("No structured education found, trying alternative approach...")
+        education = _loose_entries(index, UNIVERSITY_KEYWORDS, ("school", "degree", "duration"))
+    logger.debug("Found %d education entries", len(education))
+
+    return {
+        "name": name,
+        "headline": headline,
+        "experience": experience,
+        "education": education
+    }
+
+def is_empty_profile(profile_data) -> bool:
+    """True when an extraction produced no usable field at all."""
+    if not isinstance(profile_data, dict):
+        return True
+    return (profile_data.get("name", "N/A") == "N/A"
+            and profile_data.get("headline", "N/A") == "N/A"
+            and not profile_data.get("experience")
+            and not profile_data.get("education"))
+
+# Selectors and keyword lists handed to DOM_EXTRACTOR_JS, so both extractors share one source
+DOM_EXTRACTOR_CONFIG = {
+    "nameSelectors": NAME_SELECTORS,
+    "headlineSelectors": HEADLINE_SELECTORS,
+    "experienceItemClasses": EXPERIENCE_ITEM_CLASSES,
+    "educationItemClasses": EDUCATION_ITEM_CLASSES,
+    "titleClasses": TITLE_CLASSES,
+    "subtitleClasses": SUBTITLE_CLASSES,
+    "titleKeywords": TITLE_KEYWORDS,
+    "companyKeywords": COMPANY_KEYWORDS,
+    "experienceDurationKeywords": EXPERIENCE_DURATION_KEYWORDS,
+    "jobKeywords": JOB_KEYWORDS,
+    "schoolKeywords": SCHOOL_KEYWORDS,
+    "degreeKeywords": DEGREE_KEYWORDS,
+    "educationDurationKeywords": EDUCATION_DURATION_KEYWORDS,
+    "universityKeywords": UNIVERSITY_KEYWORDS
+}
+
+# In-page port of extract_profile for page.evaluate(DOM_EXTRACTOR_JS, DOM_EXTRACTOR_CONFIG).
+# Text follows BeautifulSoup's get_text() rules so both modes return the same strings.
+DOM_EXTRACTOR_JS = """
+(config) => {
+    const SKIP_TEXT = new Set(['SCRIPT', 'STYLE', 'TEMPLATE']);
+    const NA = 'N/A';
+
+    const textOf = (element, separator = '', strip = false) => {
+        const pieces = [];
+        const walk = (node) => {
+            for (const child of node.childNodes) {
+                if (child.nodeType === 3) {
+                    let value = child.nodeValue;
+                    if (strip) {
+                        value = value.trim();
+                        if (!value) continue;
+                    }
+                    pieces.push(value);
+                } else if (child.nodeType === 1 && !SKIP_TEXT.has(child.tagName.toUpperCase())) {
+                    walk(child);
+                }
+            }
+        };
+        walk(element);
+        return pieces.join(separator);
+    };
+    const hasAny = (text, fragments) => fragments.some((fragment) => text.includes(fragment));
+    const classText = (element) => (element.getAttribute('class') || '').toLowerCase();
+    const withClasses = (root, selector, fragments) =>
+        Array.from(root.querySelectorAll(selector)).filter((element) => hasAny(classText(element), fragments));
+    const lineList = (text) => text.split('|').map((line) => line.trim()).filter((line) => line);
+
+    const firstText = (selectors) => {
+        for (const selector of selectors) {
+            const element = document.querySelector(selector);
+            if (element) {
+                const text = textOf(element, '', true);
+                if (text) return text;
+            }
+        }
+        return NA;
+    };
+
+    const sections = Array.from(document.querySelectorAll('section'));
+    const sectionTexts = new Map();
+    const findSections = (keyword) => {
+        const byId = sections.filter((section) => (section.getAttribute('id') || '').toLowerCase().includes(keyword));
+        if (byId.length) return byId;
+        const heading = keyword.charAt(0).toUpperCase() + keyword.slice(1);
+        return sections.filter((section) => {
+            if (!sectionTexts.has(section)) sectionTexts.set(section, textOf(section));
+            return sectionTexts.get(section).includes(heading);
+        });
+    };
+
+    const parseItem = (item, keys, firstKeywords, secondKeywords, durationKeywords, secondIsKeywordOrPosition) => {
+        const lines = lineList(textOf(item, '|', true));
+        let first = NA, second = NA, duration = NA;
+        lines.forEach((line, i) => {
+            const lowered = line.toLowerCase();
+            if (i === 0 || hasAny(lowered, firstKeywords)) {
+                if (first === NA) first = line;
+            } else if (secondIsKeywordOrPosition
+                    ? (hasAny(lowered, secondKeywords) || (i === 1 && second === NA))
+                    : (hasAny(lowered, secondKeywords) && second === NA)) {
+                second = line;
+            } else if (hasAny(lowered, durationKeywords) && duration === NA) {
+                duration = line;
+            }
+        });
+        if (first === NA) {
+            const element = withClasses(item, 'span, div, a', config.titleClasses)[0];
+            if (element) first = textOf(element, '', true);
+        }
+        if (second === NA) {
+            const element = withClasses(item, 'span, div', config.subtitleClasses)[0];
+            if (element) second = textOf(element, '', true);
+        }
+        if (first === NA || Array.from(first).length <= 2) return null;
+        return {[keys[0]]: first, [keys[1]]: second, [keys[2]]: duration};
+    };
+
+    const structuredEntries = (keyword, itemClasses, limit, parse) => {
+        const entries = [];
+        for (const section of findSections(keyword)) {
+            for (const item of withClasses(section, 'li, div', itemClasses).slice(0, limit)) {
+                const entry = parse(item);
+                if (entry) entries.push(entry);
+            }
+        }
+        return entries;
+    };
+
+    const looseEntries = (keywords, keys) => {
+        const entries = [];
+        for (const div of withClasses(document, 'div', ['pvs-entity']).slice(0, 10)) {
+            const text = textOf(div, '', true);
+            if (!hasAny(text.toLowerCase(), keywords)) continue;
+            const lines = lineList(text.split('\\n').join('|'));
+            if (lines.length) {
+                entries.push({[keys[0]]: lines[0], [keys[1]]: lines.length > 1 ? lines[1] : NA, [keys[2]]: lines.length > 2 ? lines[2] : NA});
+            }
+        }
+        return entries;
+    };
+
+    const experienceKeys = ['title', 'company', 'duration'];
+    const educationKeys = ['school', 'degree', 'duration'];
+    let experience = structuredEntries('experience', config.experienceItemClasses, 5, (item) => parseItem(
+        item, experienceKeys, config.titleKeywords, config.companyKeywords, config.experienceDurationKeywords, true));
+    if (!experience.length) experience = looseEntries(config.jobKeywords, experienceKeys);
+    let education = structuredEntries('education', config.educationItemClasses, 3, (item) => parseItem(
+        item, educationKeys, config.schoolKeywords, config.degreeKeywords, config.educationDurationKeywords, false));
+    if (!education.length) education = looseEntries(config.universityKeywords, educationKeys);
+
+    return {
+        name: firstText(config.nameSelectors),
+        headline: firstText(config.headlineSelectors),
+        experience,
+        education
+    };
+}
+"""
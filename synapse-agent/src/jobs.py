@@ -0,0 +1,145 @@
+import asyncio
+import uuid
+from collections import OrderedDict
+from datetime import datetime
+
+try:
+    from .logs import get_logger, log_context
+except ImportError:
+    from logs import get_logger, log_context
+
+logger = get_logger("jobs")
+
+# Job lifecycle states; finished jobs use the same "completed"/"error" status as
+# their saved results, so /results/{job_id} reports one vocabulary throughout
+QUEUED = "queued"
+RUNNING = "running"
+COMPLETED = "completed"
+ERROR = "error"
+
+class JobQueue:
+    """
+    In-process queue for background sourcing jobs.
+
+    Jobs get an ID as soon as they are submitted and are executed by a fixed number
+    of worker tasks on the API event loop, so at most `max_workers` jobs scrape at
+    the same time. Each job record tracks its state, per-candidate progress and the
+    candidate results received so far, which lets clients poll partial results
+    while the job is still running. Finished jobs are kept in memory up to
+    `max_finished_jobs`; their full results are persisted by the runner.
+    """
+    def __init__(self, runner, max_workers: int = 2, max_finished_jobs: int = 200):
+        # runner(job) -> awaitable returning the job's final (formatted) results
+        self.runner = runner
+        self.max_workers = max_workers
+        self.max_finished_jobs = max_finished_jobs
+        self.jobs = OrderedDict()  # job_id -> job record
+        self._queue = None
+        self._workers = []
+        self._loop = None
+
+    async def start(self):
+        """Starts the worker tasks on the running event loop (called on API startup)."""
+        if self._workers:
+            return
+        self._loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue()
+        self._workers = [asyncio.create_task(self._worker(i)) for i in range(self.max_workers)]
+        logger.info("Job queue started with %d workers", self.max_workers)
+
+    async def stop(self):
+        """Cancels the workers; jobs still queued or running end with an error."""
+        for task in self._workers:
+            task.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        for job in self.jobs.values():
+            if job["status"] in (QUEUED, RUNNING):
+                self._finish(job, ERROR, error="Server shut down before the job finished")
+
+    def submit(self, params: dict) -> dict:
+        """Registers a new job and queues it; returns the job record immediately."""
+        if self._queue is None:
+            raise RuntimeError("Job queue is not running")
+        job_id = str(uuid.uuid4())
+        job = {
+            "job_id": job_id,
+            "status": QUEUED,
+            "params": params,
+            "created_at": datetime.now().isoformat(),
+            "started_at": None,
+            "finished_at": None,
+            "search_query_used": None,
+            "progress": {"total": 0, "completed": 0, "failed": 0},
+            "partial_results": [],
+            "error": None
+        }
+        self.jobs[job_id] = job
+        self._queue.put_nowait(job)
+        return job
+
+    def get(self, job_id: str):
+        return self.jobs.get(job_id)
+
+    @property
+    def depth(self) -> int:
+        """Number of jobs waiting for a worker."""
+        return self._queue.qsize() if self._queue else 0
+
+    def progress_callback(self, job: dict):
+        """
+        Returns an on_progress callback for SourcingAgent.run that may be called from
+        any thread; updates are applied to the job record on the API event loop.
+        """
+        def on_progress(event: str, data):
+            self._loop.call_soon_threadsafe(self._apply_progress, job, event, data)
+        return on_progress
+
+    def _apply_progress(self, job: dict, event: str, data):
+        if event == "search_complete":
+            job["progress"]["total"] = data.get("total", 0)
+            job["search_query_used"] = data.get("search_query")
+        elif event == "candidate":
+            job["partial_results"].append(data)
+            key = "completed" if isinstance(data, dict) and "fit_score" in data else "failed"
+            job["progress"][key] += 1
+
+    def describe(self, job: dict) -> dict:
+        """Public view of a job record (without its internal parameters)."""
+        view = {key: value for key, value in job.items() if key != "params"}
+        view["job_description"] = job["params"].get("job_description")
+        view["progress"] = dict(job["progress"])
+        view["partial_results"] = list(job["partial_results"])
+        return view
+
+    async def _worker(self, worker_id: int):
+        while True:
+            job = await self._queue.get()
+            job["status"] = RUNNING
+            job["started_at"] = datetime.now().isoformat()
+            with log_context(job_id=job["job_id"]):
+                logger.info("Job worker %d running job", worker_id)
+                try:
+                    results = await self.runner(job)
+                    if isinstance(results, dict) and results.get("status") == "error":
+                        self._finish(job, ERROR, error=results.get("error", "Unknown error"))
+                    else:
+                        self._finish(job, COMPLETED)
+                except asyncio.CancelledError:
+                    raise
+                except Exception as e:
+                    logger.exception("Job failed: %s", e)
+                    self._finish(job, ERROR, error=str(e))
+                finally:
+                    self._queue.task_done()
+
+    def _finish(self, job: dict, status: str, error: str = None):
+        job["status"] = status
+        job["error"] = error
+        job["finished_at"] = datetime.now().isoformat()
+        self._evict_finished()
+
+    def _evict_finished(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job["status"] in (COMPLETED, ERROR)]
+        for job_id in finished[:max(0, len(finished) - self.max_finished_jobs)]:
+            del self.jobs[job_id]
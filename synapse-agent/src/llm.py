@@ -0,0 +1,210 @@
+import asyncio
+import collections
+import os
+import threading
+import time
+import weakref
+from google import genai
+from google.genai import types
+
+try:
+    from . import metrics
+except ImportError:
+    import metrics
+
+class _Waiter:
+    """A thread (event) or coroutine (loop and future) queued on a ConcurrencyLimit."""
+    __slots__ = ("event", "loop", "future", "granted")
+
+    def __init__(self, event=None, loop=None, future=None):
+        self.event, self.loop, self.future = event, loop, future
+        self.granted = False
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+class ConcurrencyLimit:
+    """
+    Process-wide cap on concurrent holders, shared by threads and every event loop.
+    A released slot is handed straight to the longest waiter: a blocked thread is
+    woken through its Event, an async waiter through its loop's call_soon_threadsafe.
+    """
+    def __init__(self, limit: int):
+        self.limit = limit
+        self._lock = threading.Lock()
+        self._available = limit
+        self._waiters = collections.deque()  # _Waiter, oldest first
+
+    def acquire(self):
+        """Blocks the calling thread until a slot is free."""
+        with self._lock:
+            if self._available and not self._waiters:
+                self._available -= 1
+                return
+            waiter = _Waiter(event=threading.Event())
+            self._waiters.append(waiter)
+        waiter.event.wait()
+
+    async def acquire_async(self):
+        """Waits on the current event loop, without holding a thread, until a slot is free."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._available and not self._waiters:
+                self._available -= 1
+                return
+            waiter = _Waiter(loop=loop, future=loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except BaseException:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters.remove(waiter)
+            # Cancelled after the slot was handed over: pass it on
+            if granted:
+                self.release()
+            raise
+
+    def release(self):
+        while True:
+            with self._lock:
+                if not self._waiters:
+                    self._available += 1
+                    return
+                waiter = self._waiters.popleft()
+                waiter.granted = True
+            if waiter.event is not None:
+                waiter.event.set()
+                return
+            try:
+                waiter.loop.call_soon_threadsafe(_wake, waiter.future)
+                return
+            except RuntimeError:
+                # The waiter's loop has closed; give the slot to the next one
+                continue
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+    async def __aenter__(self):
+        await self.acquire_async()
+        return self
+
+    async def __aexit__(self, *exc):
+        self.release()
+
+class LLMClient:
+    """
+    Process-wide Gemini client shared by tools.llm_call and SourcingAgent.
+
+    A genai.Client keeps its HTTP connection pool alive, so reusing it avoids a new
+    TLS handshake per call. Async calls get one client per event loop (the API loop
+    and the browser thread's loop), because async HTTP connections cannot be shared
+    between loops. Every call, sync or async and on any loop, goes through one
+    process-wide limit of LLM_MAX_CONCURRENCY requests in flight and is timed.
+    """
+    def __init__(self, timeout_seconds: float = None, max_concurrency: int = None):
+        self.timeout_seconds = timeout_seconds or float(os.environ.get("LLM_TIMEOUT_SECONDS", "60"))
+        self.max_concurrency = max_concurrency or int(os.environ.get("LLM_MAX_CONCURRENCY", "8"))
+
+        self._lock = threading.Lock()
+        self._sync_client = None
+        self._async_clients = weakref.WeakKeyDictionary()  # event loop -> genai.Client
+        self._limit = ConcurrencyLimit(self.max_concurrency)
+
+        self.stats = {
+            "calls": 0,
+            "errors": 0,
+            "in_flight": 0,
+            "total_latency_seconds": 0.0,
+            "max_latency_seconds": 0.0
+        }
+
+    def _new_client(self):
+        # It automatically picks up GEMINI_API_KEY from environment; timeout is in milliseconds
+        return genai.Client(http_options=types.HttpOptions(timeout=int(self.timeout_seconds * 1000)))
+
+    def _client_for_sync(self):
+        with self._lock:
+            if self._sync_client is None:
+                self._sync_client = self._new_client()
+            return self._sync_client
+
+    def _client_for_loop(self):
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            client = self._async_clients.get(loop)
+            if client is None:
+                client = self._async_clients[loop] = self._new_client()
+            return client
+
+    def _call_started(self):
+        with self._lock:
+            self.stats["calls"] += 1
+            self.stats["in_flight"] += 1
+        return time.perf_counter()
+
+    def _call_finished(self, started: float, failed: bool):
+        latency = time.perf_counter() - started
+        with self._lock:
+            self.stats["in_flight"] -= 1
+            self.stats["total_latency_seconds"] += latency
+            self.stats["max_latency_seconds"] = max(self.stats["max_latency_seconds"], latency)
+            if failed:
+                self.stats["errors"] += 1
+        metrics.llm_latency.observe(latency)
+        metrics.llm_calls.inc(outcome="error" if failed else "ok")
+
+    def generate(self, prompt: str, model: str, config: types.GenerateContentConfig = None):
+        """Blocking generate_content call on the shared client."""
+        client = self._client_for_sync()
+        with self._limit:
+            started = self._call_started()
+            failed = True
+            try:
+                response = client.models.generate_content(model=model, contents=prompt, config=config)
+                failed = False
+                return response
+            finally:
+                self._call_finished(started, failed)
+
+    async def agenerate(self, prompt: str, model: str, config: types.GenerateContentConfig = None):
+        """Non-blocking generate_content call on the current event loop's client."""
+        client = self._client_for_loop()
+        async with self._limit:
+            started = self._call_started()
+            failed = True
+            try:
+                response = await client.aio.models.generate_content(model=model, contents=prompt, config=config)
+                failed = False
+                return response
+            finally:
+                self._call_finished(started, failed)
+
+    def snapshot(self) -> dict:
+        """Current call metrics, including the average latency."""
+        with self._lock:
+            stats = dict(self.stats)
+        completed = stats["calls"] - stats["in_flight"]
+        stats["avg_latency_seconds"] = round(stats["total_latency_seconds"] / completed, 3) if completed else 0.0
+        stats["total_latency_seconds"] = round(stats["total_latency_seconds"], 3)
+        stats["max_latency_seconds"] = round(stats["max_latency_seconds"], 3)
+        stats["max_concurrency"] = self.max_concurrency
+        return stats
+
+_shared_client = None
+_shared_client_lock = threading.Lock()
+
+def get_llm_client() -> LLMClient:
+    """Returns the process-wide LLMClient, creating it on first use."""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = LLMClient()
+        return _shared_client
@@ -0,0 +1,127 @@
+import atexit
+import contextvars
+import copy
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+import threading
+from contextlib import contextmanager
+
+# Level of the "synapse" loggers (DEBUG shows every selector hit and parsed entry)
+LOG_LEVEL = os.environ.get("LOG_LEVEL", "INFO").upper()
+# "text" for human-readable lines, "json" for one JSON object per line
+LOG_FORMAT = os.environ.get("LOG_FORMAT", "text").lower()
+
+# Job and candidate the current code is working for (see metrics._tracked_jobs for
+# how context variables reach tasks, worker threads and the browser loop)
+_job_id = contextvars.ContextVar("log_job_id", default=None)
+_candidate = contextvars.ContextVar("log_candidate", default=None)
+_UNSET = object()
+
+_ROOT = "synapse"
+_setup_lock = threading.Lock()
+_listener = None
+
+@contextmanager
+def log_context(job_id=_UNSET, candidate=_UNSET):
+    """Attaches job_id and/or candidate to every record logged inside the block (None clears it)."""
+    tokens = []
+    if job_id is not _UNSET:
+        tokens.append((_job_id, _job_id.set(job_id)))
+    if candidate is not _UNSET:
+        tokens.append((_candidate, _candidate.set(candidate)))
+    try:
+        yield
+    finally:
+        for var, token in reversed(tokens):
+            var.reset(token)
+
+def current_job_id():
+    """Job ID attached by the innermost log_context, if any."""
+    return _job_id.get()
+
+class ContextFilter(logging.Filter):
+    """Stamps records with the job and candidate IDs on the thread that logs them."""
+    def filter(self, record):
+        record.job_id = _job_id.get()
+        record.candidate = _candidate.get()
+        return True
+
+class TextFormatter(logging.Formatter):
+    def __init__(self):
+        super().__init__("%(asctime)s %(levelname)-7s %(name)s%(context)s %(message)s")
+
+    def format(self, record):
+        parts = []
+        if getattr(record, "job_id", None):
+            parts.append(f"job={record.job_id}")
+        if getattr(record, "candidate", None):
+            parts.append(f"candidate={record.candidate}")
+        record.context = f" [{' '.join(parts)}]" if parts else ""
+        return super().format(record)
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "job_id": getattr(record, "job_id", None),
+            "candidate": getattr(record, "candidate", None)
+        }
+        if record.exc_info:
+            entry["exception"] = self.formatException(record.exc_info)
+        if record.stack_info:
+            entry["stack"] = self.formatStack(record.stack_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+class LocalQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler for an in-process queue. The stdlib prepare() merges the traceback
+    into the message and drops exc_info so records can be pickled; nothing is pickled
+    here, so only the message is resolved and the listener's formatter still sees
+    exc_info and stack_info (e.g. JsonFormatter's "exception" field).
+    """
+    def prepare(self, record):
+        record = copy.copy(record)
+        record.msg = record.getMessage()
+        record.args = None
+        return record
+
+def setup_logging(level: str = None, fmt: str = None):
+    """
+    Routes the "synapse" loggers through a QueueHandler: callers only enqueue the
+    record, and a background QueueListener formats and writes it to stdout. Safe to
+    call more than once; only the first call installs the handlers.
+    """
+    global _listener
+    with _setup_lock:
+        root = logging.getLogger(_ROOT)
+        if _listener is not None:
+            return root
+
+        stream = logging.StreamHandler(sys.stdout)
+        stream.setFormatter(JsonFormatter() if (fmt or LOG_FORMAT) == "json" else TextFormatter())
+        records = queue.SimpleQueue()
+        handler = LocalQueueHandler(records)
+        handler.addFilter(ContextFilter())
+
+        root.setLevel(level or LOG_LEVEL)
+        root.addHandler(handler)
+        # Keep records out of the root logger (uvicorn's handlers) to avoid duplicates
+        root.propagate = False
+
+        _listener = logging.handlers.QueueListener(records, stream)
+        _listener.start()
+        # Flush whatever is still queued when the process exits
+        atexit.register(_listener.stop)
+        return root
+
+def get_logger(name: str) -> logging.Logger:
+    """Logger for one module (e.g. "tools" -> "synapse.tools"), with logging set up."""
+    setup_logging()
+    return logging.getLogger(f"{_ROOT}.{name}")
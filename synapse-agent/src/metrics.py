@@ -0,0 +1,226 @@
+import contextvars
+import functools
+import inspect
+import threading
+import time
+from contextlib import contextmanager
+
+# Upper bounds (seconds) of the stage duration and LLM latency histogram buckets
+STAGE_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0)
+LLM_LATENCY_BUCKETS = (0.25, 0.5, 1.0, 2.0, 4.0, 8.0, 15.0, 30.0, 60.0)
+
+# Every Counter created below, in order, for the Prometheus exposition
+COUNTERS = []
+
+class Counter:
+    """
+    Thread-safe monotonically increasing counter, optionally split by label values.
+    Incrementing is a dict update under a lock, cheap enough for per-profile events.
+    """
+    def __init__(self, name: str, description: str, labelnames: tuple = ()):
+        self.name = name
+        self.description = description
+        self.labelnames = labelnames
+        self._lock = threading.Lock()
+        self._values = {} if labelnames else {(): 0}  # label values -> count
+        COUNTERS.append(self)
+
+    def inc(self, amount: float = 1, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def samples(self) -> list:
+        """(labels dict, value) pairs, one per label combination seen so far."""
+        with self._lock:
+            values = sorted(self._values.items())
+        return [(dict(zip(self.labelnames, key)), value) for key, value in values]
+
+class Histogram:
+    """
+    Thread-safe fixed-bucket histogram (Prometheus style: each bucket counts the
+    observations less than or equal to its upper bound, plus a running sum).
+    """
+    def __init__(self, buckets: tuple = STAGE_BUCKETS):
+        self.buckets = tuple(sorted(buckets))
+        self._lock = threading.Lock()
+        self._counts = [0] * (len(self.buckets) + 1)  # last slot is +Inf
+        self._sum = 0.0
+        self._count = 0
+
+    def observe(self, value: float):
+        index = len(self.buckets)
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                index = i
+                break
+        with self._lock:
+            self._counts[index] += 1
+            self._sum += value
+            self._count += 1
+
+    def snapshot(self) -> dict:
+        """Cumulative bucket counts keyed by upper bound ("+Inf" last), with count and sum."""
+        with self._lock:
+            counts = list(self._counts)
+            total, count = self._sum, self._count
+        cumulative = {}
+        running = 0
+        for bound, n in zip([str(b) for b in self.buckets] + ["+Inf"], counts):
+            running += n
+            cumulative[bound] = running
+        return {"buckets": cumulative, "count": count, "sum": round(total, 6)}
+
+class StageTimings:
+    """
+    Durations of every span recorded while a job was tracked, grouped by stage.
+    Spans of concurrent pages and LLM calls overlap, so stage totals can add up
+    to more than the job's wall-clock time.
+    """
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._durations = {}  # stage -> [seconds]
+
+    def record(self, stage: str, seconds: float):
+        with self._lock:
+            self._durations.setdefault(stage, []).append(seconds)
+
+    def summary(self) -> dict:
+        """Per-stage count, total, mean, median, p95 and max in seconds."""
+        with self._lock:
+            durations = {stage: sorted(values) for stage, values in self._durations.items()}
+        summary = {}
+        for stage, values in durations.items():
+            summary[stage] = {
+                "count": len(values),
+                "total_seconds": round(sum(values), 3),
+                "mean_seconds": round(sum(values) / len(values), 3),
+                "p50_seconds": round(_percentile(values, 50), 3),
+                "p95_seconds": round(_percentile(values, 95), 3),
+                "max_seconds": round(values[-1], 3)
+            }
+        return summary
+
+def _percentile(ordered: list, pct: float) -> float:
+    return ordered[min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))]
+
+class StageMetrics:
+    """Process-wide duration histograms per stage, across every job and endpoint."""
+    def __init__(self, buckets: tuple = STAGE_BUCKETS):
+        self.buckets = buckets
+        self._lock = threading.Lock()
+        self._histograms = {}  # stage -> Histogram
+
+    def observe(self, stage: str, seconds: float):
+        histogram = self._histograms.get(stage)
+        if histogram is None:
+            with self._lock:
+                histogram = self._histograms.setdefault(stage, Histogram(self.buckets))
+        histogram.observe(seconds)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            histograms = dict(self._histograms)
+        return {stage: histogram.snapshot() for stage, histogram in sorted(histograms.items())}
+
+stage_metrics = StageMetrics()
+
+# Process-wide collectors scraped by GET /metrics
+jobs_started = Counter("synapse_jobs_started_total", "Sourcing jobs started")
+jobs_completed = Counter("synapse_jobs_completed_total", "Sourcing jobs finished, by status", ("status",))
+profiles_scraped = Counter("synapse_profiles_scraped_total", "Profiles scraped from LinkedIn (cache hits excluded)")
+profiles_failed = Counter("synapse_profiles_failed_total", "Profile scrapes that returned an error")
+authwall_hits = Counter("synapse_authwall_hits_total", "Profile loads redirected to the LinkedIn auth wall")
+llm_calls = Counter("synapse_llm_calls_total", "Gemini requests, by outcome", ("outcome",))
+llm_fallbacks = Counter("synapse_llm_fallbacks_total", "Analyses that could not use the structured LLM response, by fallback", ("kind",))
+llm_prompt_tokens = Counter("synapse_llm_prompt_tokens_total", "Prompt tokens sent to Gemini (reported by the API, else estimated), by prompt kind", ("kind",))
+llm_profile_tokens_saved = Counter("synapse_llm_profile_tokens_saved_total", "Estimated prompt tokens saved by the compact profile encoding versus indented JSON (measured with LOG_LEVEL=DEBUG only)")
+cache_lookups = Counter("synapse_cache_lookups_total", "Cache lookups, by cache and result", ("cache", "result"))
+llm_latency = Histogram(LLM_LATENCY_BUCKETS)
+
+# StageTimings of the jobs tracked in the current context. Context variables follow
+# the job into tasks, asyncio.to_thread calls and coroutines submitted to the browser loop.
+_tracked_jobs = contextvars.ContextVar("tracked_jobs", default=())
+
+@contextmanager
+def track_job():
+    """Collects every span recorded inside the block (including nested tasks) into a StageTimings."""
+    timings = StageTimings()
+    token = _tracked_jobs.set(_tracked_jobs.get() + (timings,))
+    try:
+        yield timings
+    finally:
+        _tracked_jobs.reset(token)
+
+def record(stage: str, seconds: float):
+    """Adds one duration to the process-wide histogram and to every tracked job."""
+    stage_metrics.observe(stage, seconds)
+    for timings in _tracked_jobs.get():
+        timings.record(stage, seconds)
+
+@contextmanager
+def span(stage: str):
+    """Times the enclosed block (also when it raises) as one `stage` span."""
+    started = time.perf_counter()
+    try:
+        yield
+    finally:
+        record(stage, time.perf_counter() - started)
+
+def timed(stage: str):
+    """Decorator recording each call of a sync or async function as a `stage` span."""
+    def decorate(fn):
+        if inspect.iscoroutinefunction(fn):
+            @functools.wraps(fn)
+            async def wrapper(*args, **kwargs):
+                with span(stage):
+                    return await fn(*args, **kwargs)
+        else:
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with span(stage):
+                    return fn(*args, **kwargs)
+        return wrapper
+    return decorate
+
+def _escape_label(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+def _format_labels(labels: dict) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape_label(value)}"' for name, value in labels.items()) + "}"
+
+def _format_value(value: float) -> str:
+    return str(int(value)) if float(value).is_integer() else repr(float(value))
+
+def _histogram_lines(name: str, snapshot: dict, labels: dict = None) -> list:
+    labels = labels or {}
+    lines = [f"{name}_bucket{_format_labels(dict(labels, le=bound))} {count}" for bound, count in snapshot["buckets"].items()]
+    lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(snapshot['sum'])}")
+    lines.append(f"{name}_count{_format_labels(labels)} {snapshot['count']}")
+    return lines
+
+def render_prometheus(gauges: list = ()) -> str:
+    """
+    Prometheus text exposition (format 0.0.4) of every counter, the LLM latency and
+    stage duration histograms, and the given (name, description, value) gauges,
+    which callers read from live state at scrape time (queue depth, open pages...).
+    """
+    lines = []
+    for counter in COUNTERS:
+        lines += [f"# HELP {counter.name} {counter.description}", f"# TYPE {counter.name} counter"]
+        lines += [f"{counter.name}{_format_labels(labels)} {_format_value(value)}" for labels, value in counter.samples()]
+
+    lines += ["# HELP synapse_llm_latency_seconds Latency of Gemini requests",
+              "# TYPE synapse_llm_latency_seconds histogram"]
+    lines += _histogram_lines("synapse_llm_latency_seconds", llm_latency.snapshot())
+
+    lines += ["# HELP synapse_stage_duration_seconds Duration of pipeline stage spans",
+              "# TYPE synapse_stage_duration_seconds histogram"]
+    for stage, snapshot in stage_metrics.snapshot().items():
+        lines += _histogram_lines("synapse_stage_duration_seconds", snapshot, {"stage": stage})
+
+    for name, description, value in gauges:
+        lines += [f"# HELP {name} {description}", f"# TYPE {name} gauge", f"{name} {_format_value(value)}"]
+    return "\n".join(lines) + "\n"
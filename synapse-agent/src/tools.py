@@ -2,13 +2,16 @@ import os
 import asyncio
 import sys
 import json
+import logging
+import re
+import threading
+import time
 import requests
-from bs4 import BeautifulSoup
 from dotenv import load_dotenv
-from google import genai
 from googleapiclient.discovery import build
-from playwright.async_api import Page
-from urllib.parse import urlparse, parse_qs
+from googleapiclient.http import build_http
+from playwright.async_api import Page, TimeoutError as PlaywrightTimeoutError
+from urllib.parse import urlparse, parse_qs, quote, unquote
 
 # Fix for Windows asyncio subprocess issue
 if sys.platform == "win32":
@@ -26,71 +29,357 @@ for env_path in env_paths:
         load_dotenv(env_path)
         break
 
+# Import the shared LLM client, profile extractor, stage timers and logging with fallback for both package and direct execution
+try:
+    from . import metrics
+    from .logs import get_logger
+    from .llm import get_llm_client
+    from .extractor import extract_profile, is_empty_profile, EXTRACTION_MODE, DOM_EXTRACTOR_JS, DOM_EXTRACTOR_CONFIG, NAME_SELECTORS
+except ImportError:
+    import metrics
+    from logs import get_logger
+    from llm import get_llm_client
+    from extractor import extract_profile, is_empty_profile, EXTRACTION_MODE, DOM_EXTRACTOR_JS, DOM_EXTRACTOR_CONFIG, NAME_SELECTORS
+
+logger = get_logger("tools")
+
 # This is the path where Playwright will store the browser session data.
 # It's crucial for persistent authentication.
 USER_DATA_DIR = "./playwright_user_data"
 
-# Create screenshots directory if it doesn't exist
-SCREENSHOTS_DIR = "./screenshots"
-if not os.path.exists(SCREENSHOTS_DIR):
-    os.makedirs(SCREENSHOTS_DIR)
-    print(f"Created screenshots directory: {SCREENSHOTS_DIR}")
+# Debug screenshots are opt-in: "off" (default), "failures" (failed/empty scrapes only)
+# or "sample" (failures plus one in every SCREENSHOT_SAMPLE_RATE profiles)
+SCREENSHOTS_DIR = os.environ.get("SCREENSHOTS_DIR", "./screenshots")
+DEBUG_SCREENSHOTS = os.environ.get("DEBUG_SCREENSHOTS", "off").lower()
+SCREENSHOT_SAMPLE_RATE = int(os.environ.get("SCREENSHOT_SAMPLE_RATE", "20"))
+# Every screenshot file starts with this; retention only ever deletes files named so
+SCREENSHOT_PREFIX = "synapse-debug_"
+# Retention: oldest files are deleted beyond these limits after every write
+SCREENSHOT_MAX_FILES = int(os.environ.get("SCREENSHOT_MAX_FILES", "200"))
+SCREENSHOT_MAX_MB = float(os.environ.get("SCREENSHOT_MAX_MB", "100"))
+SCREENSHOT_MAX_AGE_HOURS = float(os.environ.get("SCREENSHOT_MAX_AGE_HOURS", "72"))
+
+class DebugScreenshots:
+    """
+    Sampled debug screenshots of scraped profile pages.
+
+    Only the capture itself runs on the browser loop; the PNG is written to
+    SCREENSHOTS_DIR in a worker thread, which then prunes its own files
+    (SCREENSHOT_PREFIX) down to the configured file count, total size and age.
+    """
+    def __init__(self, mode: str = DEBUG_SCREENSHOTS, sample_rate: int = SCREENSHOT_SAMPLE_RATE,
+                 directory: str = SCREENSHOTS_DIR):
+        self.mode = mode
+        self.sample_rate = max(1, sample_rate)
+        self.directory = directory
+        self._seen = 0
+        self._pending = set()  # background write tasks, kept referenced until done
+        self._prune_lock = threading.Lock()
+
+    def should_capture(self, failed: bool) -> bool:
+        if self.mode not in ("failures", "sample"):
+            return False
+        self._seen += 1
+        if failed:
+            return True
+        return self.mode == "sample" and self._seen % self.sample_rate == 0
+
+    async def capture(self, page, profile_url: str, failed: bool):
+        if not self.should_capture(failed):
+            return
+        try:
+            data = await page.screenshot()
+        except Exception as e:
+            logger.warning("Could not take screenshot: %s", e)
+            return
+        slug = re.sub(r'[^A-Za-z0-9_-]+', '_', profile_url.rstrip('/').split('/')[-1])[:80]
+        filename = f"{SCREENSHOT_PREFIX}{time.strftime('%Y%m%d-%H%M%S')}_{slug}_{'failed' if failed else 'sample'}.png"
+        task = asyncio.create_task(asyncio.to_thread(self._write, filename, data))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    def _write(self, filename: str, data: bytes):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(os.path.join(self.directory, filename), 'wb') as f:
+                f.write(data)
+            logger.debug("Debug screenshot saved: %s", filename)
+            self._prune()
+        except OSError as e:
+            logger.warning("Could not save screenshot: %s", e)
+
+    def _prune(self):
+        with self._prune_lock:
+            files = []
+            for entry in os.scandir(self.directory):
+                # Leave other PNGs in the directory alone
+                if entry.is_file() and entry.name.startswith(SCREENSHOT_PREFIX) and entry.name.endswith('.png'):
+                    stat = entry.stat()
+                    files.append((stat.st_mtime, stat.st_size, entry.path))
+            files.sort(reverse=True)  # newest first
+
+            oldest_allowed = time.time() - SCREENSHOT_MAX_AGE_HOURS * 3600
+            max_bytes = SCREENSHOT_MAX_MB * 1024 * 1024
+            kept_bytes = 0
+            for i, (mtime, size, path) in enumerate(files):
+                kept_bytes += size
+                if i >= SCREENSHOT_MAX_FILES or kept_bytes > max_bytes or mtime < oldest_allowed:
+                    try:
+                        os.remove(path)
+                    except OSError:
+                        pass
+
+# Shared by every parser so sampling counts profiles across workers
+debug_screenshots = DebugScreenshots()
+
+# Custom Search returns at most 10 results per request and 100 per query
+CSE_PAGE_SIZE = 10
+CSE_MAX_RESULTS = 100
+
+# Query parameters that wrap the real profile URL (Google result links, LinkedIn's auth wall)
+_REDIRECT_PARAMS = ("q", "url", "sessionRedirect")
+
+def _is_linkedin_host(host: str) -> bool:
+    return host == "linkedin.com" or host.endswith(".linkedin.com")
+
+def canonicalize_linkedin_url(url: str) -> str:
+    """
+    Collapses variants of the same LinkedIn URL to one canonical key, used for search
+    de-duplication, the profile/analysis caches and the Candidate table:
+    https://www.linkedin.com/in/<lowercase slug>, without country subdomains, query
+    strings, fragments, trailing slashes or profile sub-pages (/details/..., /en).
+    Redirect links wrapping a LinkedIn URL are unwrapped; other URLs are returned as-is.
+    """
+    url = url.strip()
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    host = (parsed.hostname or "").lower()
+
+    params = parse_qs(parsed.query)
+    for key in _REDIRECT_PARAMS:
+        target = params.get(key, [""])[0]
+        if target and "linkedin.com" in target and (not _is_linkedin_host(host) or parsed.path.startswith("/authwall")):
+            return canonicalize_linkedin_url(target)
+    if not _is_linkedin_host(host):
+        return url
+
+    segments = [unquote(segment) for segment in parsed.path.split('/') if segment]
+    if len(segments) >= 2 and segments[0].lower() == "in":
+        # Public profile slugs are case-insensitive
+        segments = ["in", segments[1].lower()]
+    path = "/".join(quote(segment, safe="-_.~") for segment in segments)
+    return f"https://www.linkedin.com/{path}"
+
+def dedupe_linkedin_urls(urls: list) -> list:
+    """Canonicalizes URLs and drops duplicates, keeping the first occurrence's position."""
+    return list(dict.fromkeys(canonicalize_linkedin_url(url) for url in urls))
+
+# One Custom Search service per API key, built from the discovery document bundled
+# with google-api-python-client instead of fetching and parsing it on every search
+_search_services = {}
+_search_services_lock = threading.Lock()
+# httplib2 connections are not thread-safe, so each worker thread keeps its own
+# (reused across searches, keeping the TLS connection to Google alive)
+_search_http = threading.local()
+
+def _get_search_service(api_key: str):
+    with _search_services_lock:
+        service = _search_services.get(api_key)
+        if service is None:
+            service = build("customsearch", "v1", developerKey=api_key, static_discovery=True, cache_discovery=False)
+            _search_services[api_key] = service
+        return service
+
+def _thread_http():
+    http = getattr(_search_http, "http", None)
+    if http is None:
+        http = _search_http.http = build_http()
+    return http
+
+def _fetch_search_page(service, query: str, cse_id: str, start: int, num: int) -> list:
+    """One Custom Search request (blocking, run in a worker thread)."""
+    res = service.cse().list(q=query, cx=cse_id, start=start, num=num).execute(http=_thread_http())
+    return [item['link'] for item in res.get('items', [])]
 
 async def search_linkedin_urls(query: str, num_results: int = 10) -> list[str]:
     """
     Performs a Google search using the Google Custom Search API to find LinkedIn profile URLs.
+    Returns whatever was found, also when some result pages failed (see search_linkedin_pages).
+    """
+    urls, _ = await search_linkedin_pages(query, num_results)
+    return urls
+
+@metrics.timed("search")
+async def search_linkedin_pages(query: str, num_results: int = 10) -> tuple[list[str], bool]:
+    """
+    Custom Search for LinkedIn profile URLs, returning (urls, complete). Results beyond
+    the 10-per-request limit are fetched as concurrent pages (start offsets) and merged
+    in rank order, with canonicalized duplicates removed. complete is False when any
+    page failed, so callers can avoid caching a partial or empty result.
     """
-    print("Starting Google Custom Search for LinkedIn profiles...")
-    urls = []
+    logger.info("Starting Google Custom Search for LinkedIn profiles...")
     try:
         api_key = os.getenv("GOOGLE_API_KEY")
         cse_id = os.getenv("CUSTOM_SEARCH_ENGINE_ID")
 
         if not api_key or not cse_id:
-            print("Error: GOOGLE_API_KEY or CUSTOM_SEARCH_ENGINE_ID not found in environment variables.")
-            return []
+            logger.error("GOOGLE_API_KEY or CUSTOM_SEARCH_ENGINE_ID not found in environment variables.")
+            return [], False
 
-        service = build("customsearch", "v1", developerKey=api_key)
-        res = service.cse().list(q=f"{query} site:linkedin.com/in/", cx=cse_id, num=num_results).execute()
-        
-        if 'items' in res:
-            for item in res['items']:
-                urls.append(item['link'])
-        
-        print(f"Found {len(urls)} potential profile URLs.")
-        return urls
+        service = await asyncio.to_thread(_get_search_service, api_key)
+        full_query = f"{query} site:linkedin.com/in/"
+        num_results = max(1, min(num_results, CSE_MAX_RESULTS))
+        pages = [
+            (start, min(CSE_PAGE_SIZE, num_results - start + 1))
+            for start in range(1, num_results + 1, CSE_PAGE_SIZE)
+        ]
+        page_results = await asyncio.gather(
+            *(asyncio.to_thread(_fetch_search_page, service, full_query, cse_id, start, num) for start, num in pages),
+            return_exceptions=True
+        )
+
+        urls = []
+        seen = set()
+        errors = []
+        for (start, _), result in zip(pages, page_results):
+            if isinstance(result, Exception):
+                logger.warning("Custom Search page starting at %d failed: %s", start, result)
+                errors.append(result)
+                continue
+            for link in result:
+                canonical = canonicalize_linkedin_url(link)
+                if canonical not in seen:
+                    seen.add(canonical)
+                    urls.append(canonical)
+        if len(errors) == len(pages):
+            raise errors[0]
+        if errors:
+            logger.warning("%d of %d Custom Search result pages failed; results are partial.", len(errors), len(pages))
+
+        logger.info("Found %d potential profile URLs across %d result pages.", len(urls), len(pages))
+        return urls[:num_results], not errors
 
     except requests.exceptions.ConnectionError as e:
-        print(f"Network Error: Could not connect to Google's servers. This is likely a local network issue (firewall, proxy, DNS). Details: {e}")
-        return []
+        logger.error("Network Error: Could not connect to Google's servers. This is likely a local network issue (firewall, proxy, DNS). Details: %s", e)
+        return [], False
     except Exception as e:
         # Catching potential googleapiclient errors specifically if possible
         if "NameResolutionError" in str(e) or "gaierror" in str(e):
-             print(f"Network Error: DNS resolution failed for Google's servers. Check your internet connection and DNS settings. Details: {e}")
+             logger.error("Network Error: DNS resolution failed for Google's servers. Check your internet connection and DNS settings. Details: %s", e)
         else:
-            print(f"An unexpected error occurred during the Google Custom Search: {e}")
-        return []
+            logger.error("An unexpected error occurred during the Google Custom Search: %s", e)
+        return [], False
+
+# Per-profile readiness budget, and how long a page gets to render the lazily loaded
+# experience/education cards (counted from when the name appeared, or from navigation
+# on pages without a name) before we scrape whatever is there
+PROFILE_READY_TIMEOUT_SECONDS = float(os.environ.get("PROFILE_READY_TIMEOUT_SECONDS", "10"))
+PROFILE_READY_SETTLE_SECONDS = float(os.environ.get("PROFILE_READY_SETTLE_SECONDS", "1.5"))
+
+# Evaluated on every animation frame by page.wait_for_function; checks all selectors at once.
+# The top card is itself a <section>, so readiness needs a content card outside it.
+PROFILE_READY_JS = """
+(config) => {
+    const nameElement = config.nameSelectors
+        .map((selector) => document.querySelector(selector))
+        .find((element) => element && element.textContent.trim());
+    if (nameElement) {
+        const topCard = nameElement.closest('section');
+        const contentCard = config.contentSelectors.some((selector) =>
+            Array.from(document.querySelectorAll(selector)).some((element) => !topCard || !topCard.contains(element)));
+        if (contentCard) return true;
+        if (window.__synapseNameSeenAt === undefined) window.__synapseNameSeenAt = performance.now();
+    }
+    // Sparse profiles never grow experience/education cards, and guest and error pages
+    // have no name; take them once loaded and settled
+    const since = nameElement ? window.__synapseNameSeenAt : 0;
+    return document.readyState === 'complete'
+        && performance.now() - since >= config.settleMs
+        && config.mainSelectors.some((selector) => document.querySelector(selector));
+}
+"""
+
+PROFILE_READY_CONFIG = {
+    "nameSelectors": NAME_SELECTORS,
+    # Experience and education cards (logged-in and guest layouts)
+    "contentSelectors": [
+        "#experience", "#education", "section[data-view-name='profile-card']",
+        "section[id^='experience']", "section[id^='education']",
+        "section[data-section='experience']", "section[data-section^='education']"
+    ],
+    "mainSelectors": [".scaffold-layout__main", ".application-outlet", "main", ".profile", "[data-section='profile']", "body"],
+    "settleMs": int(PROFILE_READY_SETTLE_SECONDS * 1000)
+}
+
+class DomainRateLimiter:
+    """
+    Spaces out requests to the same domain so that concurrent scraping workers
+    stay polite. Each call reserves the next free slot for the URL's domain and
+    sleeps until that slot comes up, replacing the old fixed sleep per profile.
+    """
+    def __init__(self, min_interval: float = 2.0):
+        self.min_interval = min_interval
+        self._next_slot = {}
+
+    @staticmethod
+    def _domain_key(url: str) -> str:
+        # uk.linkedin.com and www.linkedin.com share one budget
+        host = urlparse(url).netloc.lower().split(':')[0]
+        return ".".join(host.split('.')[-2:])
+
+    async def wait(self, url: str):
+        domain = self._domain_key(url)
+        now = time.monotonic()
+        slot = max(now, self._next_slot.get(domain, now))
+        self._next_slot[domain] = slot + self.min_interval
+        delay = slot - now
+        if delay > 0:
+            await asyncio.sleep(delay)
 
 class LinkedInParser:
     """
     This class now uses Playwright's Async API for non-blocking browser automation,
     making it compatible with FastAPI.
     """
-    def __init__(self, page: Page):
+    def __init__(self, page: Page, resource_filter=None):
         self.page = page
+        # Optional browser.ResourceFilter routing this page's requests; its counters
+        # are reset per profile and copied to last_profile_stats after each scrape
+        self.resource_filter = resource_filter
+        self.last_profile_stats = None
 
+    @metrics.timed("scrape_profile")
     async def scrape_profile(self, profile_url: str):
+        """
+        Scrapes one profile, then records its network counters and, when enabled,
+        a sampled debug screenshot (always considered for failed or empty scrapes).
+        """
+        if self.resource_filter:
+            self.resource_filter.reset()
+        profile_data = await self._scrape_profile(profile_url)
+
+        failed = bool(profile_data.get("error")) or is_empty_profile(profile_data)
+        await debug_screenshots.capture(self.page, profile_url, failed)
+
+        if self.resource_filter:
+            self.last_profile_stats = self.resource_filter.snapshot()
+            logger.debug("Network: %d requests, %d blocked, %.0f KB", self.last_profile_stats['requests'],
+                         self.last_profile_stats['blocked'], self.last_profile_stats['bytes'] / 1024)
+        return profile_data
+
+    async def _scrape_profile(self, profile_url: str):
         """
         This method is updated to use Playwright's Async API with more robust selectors.
         """
         try:
-            print(f"Navigating to: {profile_url}")
-            await self.page.goto(profile_url, wait_until='domcontentloaded')
+            logger.debug("Navigating to: %s", profile_url)
+            with metrics.span("navigation"):
+                await self.page.goto(profile_url, wait_until='domcontentloaded')
             
             # Check if we're redirected to auth wall
             current_url = self.page.url
             if "authwall" in current_url or "login" in current_url:
-                print(f"Hit LinkedIn auth wall, current URL: {current_url}")
+                logger.warning("Hit LinkedIn auth wall, current URL: %s", current_url)
+                metrics.authwall_hits.inc()
                 return {
                     "error": "LinkedIn authentication required - hit auth wall",
                     "name": "N/A",
@@ -99,298 +388,28 @@ class LinkedInParser:
                     "education": []
                 }
             
-            # Try multiple possible selectors for LinkedIn's main content
-            main_selectors = [
-                ".scaffold-layout__main",
-                ".application-outlet", 
-                "main",
-                ".profile",
-                "[data-section='profile']",
-                "body"
-            ]
-            
-            main_content_found = False
-            for selector in main_selectors:
-                try:
-                    await self.page.wait_for_selector(selector, timeout=5000)
-                    main_content_found = True
-                    print(f"Found main content with selector: {selector}")
-                    break
-                except:
-                    continue
-            
-            if not main_content_found:
-                print(f"Warning: Could not find main content selectors, proceeding anyway...")
-            
-            # Wait a bit more for dynamic content to load
-            await asyncio.sleep(3)
+            # Wait until the top card and a content card have rendered (or the page settled without them)
+            await self._wait_until_ready()
             
-            # Take a screenshot for debugging (optional)
-            try:
-                await self.page.screenshot(path=f"debug_screenshot_{profile_url.split('/')[-1]}.png")
-                print(f"Debug screenshot saved for {profile_url}")
-            except Exception as e:
-                print(f"Could not save screenshot: {e}")
-
-            content = await self.page.content()
-            soup = BeautifulSoup(content, 'html.parser')
-
-            # Debug: Print page title to verify we're on the right page
-            page_title = await self.page.title()
-            print(f"Page title: {page_title}")
-
-            # Try multiple possible selectors for name
-            name = "N/A"
-            name_selectors = [
-                'h1.text-heading-xlarge',
-                'h1[data-test="profile-title"]',
-                '.profile-info__name',
-                '.top-card-layout__title',
-                'h1.top-card-layout__title',
-                '.pv-text-details__title',
-                'h1',  # Generic h1 as fallback
-                '.artdeco-entity-lockup__title'
-            ]
-            
-            for selector in name_selectors:
-                name_elem = soup.select_one(selector)
-                if name_elem and name_elem.get_text(strip=True):
-                    name = name_elem.get_text(strip=True)
-                    print(f"Found name '{name}' with selector: {selector}")
-                    break
-            
-            if name == "N/A":
-                print("Could not find candidate name with any selector")
-                # Debug: Print some of the page content to see what we're working with
-                h1_tags = soup.find_all('h1')
-                print(f"Found {len(h1_tags)} h1 tags on page")
-                for i, h1 in enumerate(h1_tags[:3]):  # Print first 3 h1 tags
-                    print(f"H1 {i+1}: {h1.get_text(strip=True)[:100]}")  # First 100 chars
-            
-            # Try multiple possible selectors for headline/title
-            headline = "N/A"
-            headline_selectors = [
-                'div.text-body-medium',
-                '.top-card-layout__headline',
-                '.pv-text-details__title-text',
-                '.profile-info__headline',
-                '.text-body-medium.break-words',
-                '[data-generated-suggestion-target]'
-            ]
-            
-            for selector in headline_selectors:
-                headline_elem = soup.select_one(selector)
-                if headline_elem and headline_elem.get_text(strip=True):
-                    headline = headline_elem.get_text(strip=True)
-                    print(f"Found headline '{headline}' with selector: {selector}")
-                    break
-            
-            profile_data = {
-                "name": name,
-                "headline": headline,
-                "experience": [],
-                "education": []
-            }
+            # Debug: Log page title to verify we're on the right page
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Page title: %s", await self.page.title())
 
-            # Modern LinkedIn Experience Section - Updated selectors
-            print("Looking for experience section...")
-            
-            # Try multiple approaches to find experience
-            experience_found = False
-            
-            # Approach 1: Look for modern LinkedIn experience structure
-            experience_sections = soup.find_all('section', {'id': lambda x: x and 'experience' in x.lower()})
-            if not experience_sections:
-                # Look for sections containing "Experience" text
-                all_sections = soup.find_all('section')
-                for section in all_sections:
-                    if section.get_text() and 'Experience' in section.get_text():
-                        experience_sections.append(section)
-            
-            print(f"Found {len(experience_sections)} potential experience sections")
-            
-            for section in experience_sections:
-                # Look for modern LinkedIn list items
-                experience_items = section.find_all(['li', 'div'], class_=lambda x: x and any(
-                    cls in str(x).lower() for cls in ['pvs-entity', 'experience-item', 'entity-result', 'profile-section-card']))
-                
-                print(f"Found {len(experience_items)} potential experience items in section")
-                
-                for item in experience_items[:5]:  # Limit to first 5 experiences
-                    try:
-                        # Get all text content and try to parse it
-                        full_text = item.get_text(separator='|', strip=True)
-                        lines = [line.strip() for line in full_text.split('|') if line.strip()]
-                        
-                        # Look for job title (usually first non-empty line or with role keywords)
-                        title = "N/A"
-                        company = "N/A" 
-                        duration = "N/A"
-                        
-                        for i, line in enumerate(lines):
-                            # Title is usually first or contains job keywords
-                            if i == 0 or any(keyword in line.lower() for keyword in ['engineer', 'developer', 'manager', 'analyst', 'director', 'ceo', 'founder', 'lead']):
-                                if title == "N/A":
-                                    title = line
-                            # Company is often after title or contains company indicators
-                            elif any(keyword in line.lower() for keyword in ['inc', 'corp', 'company', 'ltd', 'llc']) or (i == 1 and company == "N/A"):
-                                company = line
-                            # Duration contains time indicators
-                            elif any(keyword in line.lower() for keyword in ['year', 'month', 'present', '2020', '2021', '2022', '2023', '2024', '2025']) and duration == "N/A":
-                                duration = line
-                        
-                        # Alternative: Look for specific elements with better selectors
-                        if title == "N/A":
-                            title_elem = item.find(['span', 'div', 'a'], class_=lambda x: x and any(
-                                cls in str(x).lower() for cls in ['entity-result__title', 't-16', 't-bold', 'profile-section-card__title']))
-                            if title_elem:
-                                title = title_elem.get_text(strip=True)
-                        
-                        if company == "N/A":
-                            company_elem = item.find(['span', 'div'], class_=lambda x: x and any(
-                                cls in str(x).lower() for cls in ['entity-result__subtitle', 't-14', 'profile-section-card__subtitle']))
-                            if company_elem:
-                                company = company_elem.get_text(strip=True)
-                        
-                        # Only add if we found meaningful data
-                        if title != "N/A" and len(title) > 2:
-                            profile_data["experience"].append({
-                                "title": title,
-                                "company": company,
-                                "duration": duration
-                            })
-                            experience_found = True
-                            print(f"Found experience: {title} at {company}")
-                    except (AttributeError, TypeError) as e:
-                        print(f"Error parsing experience item: {e}")
-                        continue
-            
-            # Approach 2: If no structured experience found, look for any job-related content
-            if not experience_found:
-                print("No structured experience found, trying alternative approach...")
-                all_text_divs = soup.find_all('div', class_=lambda x: x and 'pvs-entity' in str(x).lower())
-                
-                for div in all_text_divs[:10]:  # Check first 10 divs
-                    text_content = div.get_text(strip=True)
-                    # Look for job-related keywords
-                    if any(keyword in text_content.lower() for keyword in [
-                        'engineer', 'developer', 'manager', 'analyst', 'director', 'ceo', 'founder', 'lead',
-                        'software', 'python', 'machine learning', 'full-time', 'part-time'
-                    ]):
-                        lines = [line.strip() for line in text_content.replace('\n', '|').split('|') if line.strip()]
-                        if len(lines) >= 1:
-                            profile_data["experience"].append({
-                                "title": lines[0],
-                                "company": lines[1] if len(lines) > 1 else "N/A",
-                                "duration": lines[2] if len(lines) > 2 else "N/A"
-                            })
-                            experience_found = True
-                            print(f"Found alternative experience: {lines[0]}")
-
-            print(f"Found {len(profile_data['experience'])} experience entries")
-
-            # Modern LinkedIn Education Section - Updated selectors
-            print("Looking for education section...")
-            
-            education_found = False
-            
-            # Approach 1: Look for modern LinkedIn education structure
-            education_sections = soup.find_all('section', {'id': lambda x: x and 'education' in x.lower()})
-            if not education_sections:
-                # Look for sections containing "Education" text
-                all_sections = soup.find_all('section')
-                for section in all_sections:
-                    if section.get_text() and 'Education' in section.get_text():
-                        education_sections.append(section)
-            
-            print(f"Found {len(education_sections)} potential education sections")
-            
-            for section in education_sections:
-                # Look for modern LinkedIn list items
-                education_items = section.find_all(['li', 'div'], class_=lambda x: x and any(
-                    cls in str(x).lower() for cls in ['pvs-entity', 'education-item', 'entity-result', 'profile-section-card']))
-                
-                print(f"Found {len(education_items)} potential education items in section")
-                
-                for item in education_items[:3]:  # Limit to first 3 education entries
-                    try:
-                        # Get all text content and try to parse it
-                        full_text = item.get_text(separator='|', strip=True)
-                        lines = [line.strip() for line in full_text.split('|') if line.strip()]
-                        
-                        # Look for school name and degree
-                        school = "N/A"
-                        degree = "N/A"
-                        duration = "N/A"
-                        
-                        for i, line in enumerate(lines):
-                            # School is usually first or contains university keywords
-                            if i == 0 or any(keyword in line.lower() for keyword in ['university', 'college', 'institute', 'school']):
-                                if school == "N/A":
-                                    school = line
-                            # Degree contains education keywords
-                            elif any(keyword in line.lower() for keyword in ['bachelor', 'master', 'phd', 'degree', 'engineering', 'science', 'arts']) and degree == "N/A":
-                                degree = line
-                            # Duration contains time indicators
-                            elif any(keyword in line.lower() for keyword in ['year', 'month', '2015', '2016', '2017', '2018', '2019', '2020', '2021', '2022', '2023', '2024', '2025']) and duration == "N/A":
-                                duration = line
-                        
-                        # Alternative: Look for specific elements with better selectors
-                        if school == "N/A":
-                            school_elem = item.find(['span', 'div', 'a'], class_=lambda x: x and any(
-                                cls in str(x).lower() for cls in ['entity-result__title', 't-16', 't-bold', 'profile-section-card__title']))
-                            if school_elem:
-                                school = school_elem.get_text(strip=True)
-                        
-                        if degree == "N/A":
-                            degree_elem = item.find(['span', 'div'], class_=lambda x: x and any(
-                                cls in str(x).lower() for cls in ['entity-result__subtitle', 't-14', 'profile-section-card__subtitle']))
-                            if degree_elem:
-                                degree = degree_elem.get_text(strip=True)
-                        
-                        # Only add if we found meaningful data
-                        if school != "N/A" and len(school) > 2:
-                            profile_data["education"].append({
-                                "school": school,
-                                "degree": degree,
-                                "duration": duration
-                            })
-                            education_found = True
-                            print(f"Found education: {degree} from {school}")
-                    except (AttributeError, TypeError) as e:
-                        print(f"Error parsing education item: {e}")
-                        continue
-            
-            # Approach 2: Look for university/college names anywhere on the page
-            if not education_found:
-                print("No structured education found, trying alternative approach...")
-                # Look for well-known universities and colleges
-                university_keywords = [
-                    'harvard', 'stanford', 'mit', 'yale', 'princeton', 'caltech', 'columbia', 'upenn', 'dartmouth', 'brown',
-                    'cornell', 'duke', 'northwestern', 'johns hopkins', 'chicago', 'berkeley', 'ucla', 'usc', 'nyu',
-                    'university', 'college', 'institute', 'school of', 'tech', 'iit', 'bits'
-                ]
-                
-                all_text_divs = soup.find_all('div', class_=lambda x: x and 'pvs-entity' in str(x).lower())
-                for div in all_text_divs[:10]:
-                    text_content = div.get_text(strip=True)
-                    if any(keyword in text_content.lower() for keyword in university_keywords):
-                        lines = [line.strip() for line in text_content.replace('\n', '|').split('|') if line.strip()]
-                        if len(lines) >= 1:
-                            profile_data["education"].append({
-                                "school": lines[0],
-                                "degree": lines[1] if len(lines) > 1 else "N/A",
-                                "duration": lines[2] if len(lines) > 2 else "N/A"
-                            })
-                            education_found = True
-                            print(f"Found alternative education: {lines[0]}")
-
-            print(f"Found {len(profile_data['education'])} education entries")
+            # Extract inside the page so only the records cross over, not the whole DOM
+            if EXTRACTION_MODE == "dom":
+                profile_data = await self._extract_in_page()
+                if not is_empty_profile(profile_data):
+                    return profile_data
+                logger.info("In-page extraction returned nothing, falling back to HTML parsing")
 
-            return profile_data
+            with metrics.span("html_parse"):
+                content = await self.page.content()
+
+                # Parse and index the page once, then extract every field from the index
+                return extract_profile(content)
 
         except Exception as e:
-            print(f"An error occurred while scraping {profile_url}: {e}")
+            logger.error("An error occurred while scraping %s: %s", profile_url, e)
             # It's good practice to return a more structured error or empty state
             return {
                 "error": str(e),
@@ -400,6 +419,34 @@ class LinkedInParser:
                 "education": []
             }
 
+    @metrics.timed("readiness_wait")
+    async def _wait_until_ready(self):
+        """
+        Waits until the profile is ready to scrape, within PROFILE_READY_TIMEOUT_SECONDS.
+        A page that is still not ready when the budget runs out is scraped anyway.
+        """
+        started = time.perf_counter()
+        try:
+            await self.page.wait_for_function(
+                PROFILE_READY_JS, arg=PROFILE_READY_CONFIG, timeout=PROFILE_READY_TIMEOUT_SECONDS * 1000
+            )
+            logger.debug("Profile ready after %.2fs", time.perf_counter() - started)
+        except PlaywrightTimeoutError:
+            logger.warning("Profile not ready after %.0fs, proceeding anyway...", PROFILE_READY_TIMEOUT_SECONDS)
+
+    @metrics.timed("dom_extract")
+    async def _extract_in_page(self):
+        """Runs the JavaScript profile extractor in the page; returns None if it fails."""
+        try:
+            profile_data = await self.page.evaluate(DOM_EXTRACTOR_JS, DOM_EXTRACTOR_CONFIG)
+            logger.debug("In-page extraction: %d experience, %d education entries",
+                         len(profile_data.get('experience', [])), len(profile_data.get('education', [])))
+            return profile_data
+        except Exception as e:
+            logger.warning("In-page extraction failed: %s", e)
+            return None
+
+    @metrics.timed("outreach")
     async def send_connection_request(self, profile_url: str, message: str):
         """
         This method is updated to use Playwright's Async API.
@@ -415,11 +462,11 @@ class LinkedInParser:
             await self.page.locator("#custom-message").fill(message)
             await self.page.locator("button:has-text('Send now')").click()
             
-            print(f"Successfully sent connection request to {profile_url}")
+            logger.info("Successfully sent connection request to %s", profile_url)
             await asyncio.sleep(2)
             return True
         except Exception as e:
-            print(f"Failed to send connection request to {profile_url}: {e}")
+            logger.warning("Failed to send connection request to %s: %s", profile_url, e)
             try:
                 await self.page.locator("button[aria-label='Dismiss']").click()
             except Exception:
@@ -428,18 +475,13 @@ class LinkedInParser:
 
 def llm_call(prompt: str):
     try:
-        # Create the client - it automatically picks up GEMINI_API_KEY from environment
-        client = genai.Client()
-        
-        response = client.models.generate_content(
-            model="gemini-2.5-flash",
-            contents=prompt
-        )
+        # Reuse the process-wide client instead of building one per call
+        response = get_llm_client().generate(prompt, model="gemini-2.5-flash")
         
         return response.text
 
     except Exception as e:
-        print(f"An error occurred during the LLM call: {e}")
+        logger.error("An error occurred during the LLM call: %s", e)
         # Return a basic JSON structure if everything fails
         return json.dumps({
             "name": "Unknown",
@@ -455,5 +497,6 @@ def llm_call(prompt: str):
             },
             "reasoning": f"Failed to analyze profile due to LLM error: {e}",
             "confidence_score": 0.0,
-            "outreach_message": "Unable to generate personalized message"
+            "outreach_message": "Unable to generate personalized message",
+            "analysis_error": True
         })